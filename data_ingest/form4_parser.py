@@ -10,12 +10,31 @@ Transaction Codes:
 """
 import os
 import re
+import json
 import time
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from xml.etree import ElementTree as ET
 import requests
 
+# SEC fair-access cap is 10 requests/second; shared by all fetching threads
+SEC_MIN_INTERVAL = 0.1
+_throttle_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def _sec_get(url: str, headers: Dict[str, str]) -> requests.Response:
+    """requests.get spaced at least SEC_MIN_INTERVAL apart across threads."""
+    global _next_request_at
+    with _throttle_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + SEC_MIN_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+    return requests.get(url, headers=headers, timeout=10)
+
 
 def fetch_form4_xml(accession_number: str, cik: str) -> Optional[str]:
     """
@@ -33,7 +52,7 @@ def fetch_form4_xml(accession_number: str, cik: str) -> Optional[str]:
     headers = {"User-Agent": ua}
     
     try:
-        resp = requests.get(index_url, headers=headers, timeout=10)
+        resp = _sec_get(index_url, headers)
         if resp.status_code == 200:
             # Find all wk-form4_*.xml links
             all_xml = re.findall(r'href="([^"]*wk-form4[^"]*\.xml)"', resp.text)
@@ -49,8 +68,7 @@ def fetch_form4_xml(accession_number: str, cik: str) -> Optional[str]:
                 else:
                     xml_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{acc_no_dashes}/{xml_path}"
                 
-                time.sleep(0.15)  # Polite rate limit
-                resp = requests.get(xml_url, headers=headers, timeout=10)
+                resp = _sec_get(xml_url, headers)  # Polite rate limit
                 if resp.status_code == 200 and b"<ownershipDocument>" in resp.content:
                     return resp.text
     except Exception as e:
@@ -59,6 +77,43 @@ def fetch_form4_xml(accession_number: str, cik: str) -> Optional[str]:
     return None
 
 
+def _form4_cache_path(accession_number: str, cik: str) -> Optional[Path]:
+    if os.environ.get("FORM4_CACHE_DISABLE") == "1":
+        return None
+    root = Path(os.environ.get("FORM4_CACHE_DIR", ".state/form4"))
+    return root / str(cik) / f"{accession_number}.json"
+
+
+def parse_form4_cached(accession_number: str, cik: str) -> Optional[Dict[str, Any]]:
+    """
+    fetch_form4_xml + parse_form4_xml with an on-disk cache of the parsed result,
+    keyed by (cik, accession_number). Filings are immutable, so warm reruns skip
+    the SEC round-trips entirely. Failed fetches are not cached (may be transient).
+    Cache dir: FORM4_CACHE_DIR (default .state/form4); FORM4_CACHE_DISABLE=1 bypasses.
+    """
+    path = _form4_cache_path(accession_number, cik)
+    if path is not None and path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass  # unreadable entry: refetch and overwrite
+    
+    xml = fetch_form4_xml(accession_number, cik)
+    if not xml:
+        return None
+    parsed = parse_form4_xml(xml)
+    
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(parsed, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        except OSError:
+            pass  # cache is best-effort
+    return parsed
+
+
 def parse_form4_xml(xml_text: str) -> Dict[str, Any]:
     """
     Parse Form 4 XML and extract transaction details.
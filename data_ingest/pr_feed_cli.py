@@ -174,8 +174,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     # Cache update (HTTP only)
     if is_http(url) and not args.no_cache:
         try:
-            update_cache_from_parsed(url, parsed, cache, now_ts=time.strftime("%Y-%m-%dT%H:%M:%SZ"))
-            save_cache(args.cache_file, cache)
+            if update_cache_from_parsed(url, parsed, cache, now_ts=time.strftime("%Y-%m-%dT%H:%M:%SZ")):
+                save_cache(args.cache_file, cache)
         except Exception:
             pass
 
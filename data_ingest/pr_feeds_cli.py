@@ -130,6 +130,7 @@ def _iter_urls(args: argparse.Namespace) -> Iterable[str]:
 def main(argv: Optional[List[str]] = None) -> int:
     args = _parse_args(argv)
     cache: Dict[str, Dict[str, str]] = {}
+    cache_dirty = False
     if not args.no_cache:
         cache = load_cache(args.cache_file)
 
@@ -190,7 +191,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 
         if is_http(url) and not args.no_cache:
             try:
-                update_cache_from_parsed(url, parsed, cache, now_ts=time.strftime("%Y-%m-%dT%H%M%SZ"))
+                if update_cache_from_parsed(url, parsed, cache, now_ts=time.strftime("%Y-%m-%dT%H%M%SZ")):
+                    cache_dirty = True
             except Exception:
                 pass
 
@@ -198,7 +200,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         if len(rows) >= args.max:
             break
 
-    if not args.no_cache:
+    if cache_dirty:
         try:
             save_cache(args.cache_file, cache)
         except Exception:
@@ -1,12 +1,14 @@
 import os
 import sys
-import json
 import argparse
 from pathlib import Path
 from datetime import datetime, timezone
 import urllib.request
 
+from shared.jsonl import dumps_line
+
 OUT_DIR = Path(os.getenv("RAW_QUEUE_DIR", "queue/raw_events"))
+WRITE_BATCH = 1024
 
 def fetch_text(url: str, user_agent: str) -> str:
     if url.startswith("file:"):
@@ -25,12 +27,13 @@ def parse_tsv(feed_text: str):
     """
     for line in feed_text.splitlines():
         line = line.strip()
-        if not line or line.startswith("#"):
+        if not line or line[0] == "#":
             continue
-        parts = line.split("\t")
+        # Cap the split at 7 fields; any extra tabs stay inside TITLE
+        parts = line.split("\t", 6)
         if len(parts) < 7:
             continue
-        ts, cik, ticker, company, doctype, url, title = parts[:7]
+        ts, cik, ticker, company, doctype, url, title = parts
         yield {
             "source": "SEC",
             "title": title,
@@ -52,10 +55,18 @@ def write_ndjson(items, out_dir: Path) -> Path:
     now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     out_path = out_dir / f"sec_{now}.jsonl"
     count = 0
-    with out_path.open("w", encoding="utf-8") as f:
+    # Write in batches of WRITE_BATCH lines: one write() per batch instead of per item
+    batch = []
+    with out_path.open("wb") as f:
         for it in items:
-            f.write(json.dumps(it, ensure_ascii=False) + "\n")
-            count += 1
+            batch.append(dumps_line(it))
+            if len(batch) >= WRITE_BATCH:
+                f.write(b"".join(batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            f.write(b"".join(batch))
+            count += len(batch)
     print(f"[SEC] wrote: {out_path} ({count} items)")
     return out_path
 
@@ -2,12 +2,53 @@
 Load company universe from ref/universe.tsv with sector/industry data.
 """
 import csv
+import os
+import pickle
 from pathlib import Path
 from typing import Dict, Optional
 
+__all__ = ["load_universe", "load_map"]
+
+def _cache_path(path: Path) -> Path:
+    # ref/universe.tsv -> ref/.universe.pkl
+    return path.with_name(f".{path.stem}.pkl")
+
+
 def load_universe(path: Path = Path("ref/universe.tsv")) -> Dict[str, Dict[str, Optional[str]]]:
     """
-    Load company universe from TSV with headers:
+    Load company universe, reusing a pickle cache next to the TSV while its
+    mtime/size are unchanged. Set UNIVERSE_CACHE_DISABLE=1 to always re-parse.
+    """
+    if not path.exists():
+        return {}
+    if os.environ.get("UNIVERSE_CACHE_DISABLE") == "1":
+        return _parse_universe(path)
+
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache = _cache_path(path)
+    try:
+        with cache.open("rb") as f:
+            cached_stamp, m = pickle.load(f)
+        if cached_stamp == stamp:
+            return m
+    except Exception:
+        pass  # missing/stale/corrupt cache -> re-parse
+
+    m = _parse_universe(path)
+    try:
+        tmp = cache.with_suffix(cache.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((stamp, m), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(cache)
+    except OSError:
+        pass  # read-only ref/ dir: cache is best-effort
+    return m
+
+
+def _parse_universe(path: Path) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Parse company universe from TSV with headers:
       ticker  cik  name  sector  industry
     
     Returns dict keyed by normalized CIK (no leading zeros) with:
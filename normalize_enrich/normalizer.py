@@ -1,13 +1,22 @@
 import os
-import json
+import re
 import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List
+from shared.dedupe import precompute_dedupe_key
+from shared.jsonl import dumps_line, loads
+from shared.watchlist import precompute_ids
 from .cik_ticker_map import load_map
 
 IN_DIR  = Path(os.getenv("RAW_QUEUE_DIR", "queue/raw_events"))
 OUT_DIR = Path(os.getenv("NORM_QUEUE_DIR", "queue/normalized_events"))
+READ_BUFFER = 1 << 20
+WRITE_BATCH = 1024
+
+# Strict 'YYYY-MM-DDTHH:MM:SSZ', ASCII digits only (int() alone would take signs/'_'/Unicode digits)
+_STRICT_Z = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$", re.ASCII)
 
 def to_iso_utc(ts: str):
     """
@@ -16,6 +25,16 @@ def to_iso_utc(ts: str):
     """
     if not ts:
         return None
+    # Fast path: strict 'YYYY-MM-DDTHH:MM:SSZ' (the common SEC/PR shape)
+    if len(ts) == 20 and _STRICT_Z.match(ts):
+        try:
+            return datetime(
+                int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                int(ts[11:13]), int(ts[14:16]), int(ts[17:19]),
+                tzinfo=timezone.utc,
+            ).isoformat()
+        except ValueError:
+            return None
     try:
         # ISO-like: 2025-10-04T12:00:00Z
         return datetime.fromisoformat(ts.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
@@ -123,32 +142,77 @@ def normalize_one(d: Dict[str, Any], refmap):
         if not norm.get("first_url") and urls:
             norm["first_url"] = urls[0]
     
+    # Canonical dedupe identity, computed once here instead of per signal
+    key = precompute_dedupe_key(norm)
+    if key is not None:
+        norm["_dedupe_key"] = key
+    # Canonical (ticker, cik) for the signal-stage watchlist gate
+    norm["_ids"] = precompute_ids(norm)
+    
     return norm
 
+# Per-worker refmap, installed once by _init_worker (avoids re-pickling per file)
+_REFMAP: Dict[str, Any] = {}
+
+def _init_worker(refmap) -> None:
+    global _REFMAP
+    _REFMAP = refmap
+
+def _norm_file(fp: Path) -> int:
+    """Normalize one raw NDJSON file into OUT_DIR; returns the item count."""
+    out_fp = OUT_DIR / fp.name.replace(".jsonl", ".norm.jsonl")
+    count = 0
+    # Output goes out in batches of WRITE_BATCH lines: one write() per batch
+    batch = []
+    # Binary input with a 1 MiB buffer: fewer read syscalls, no text-layer decode
+    # (loads takes the UTF-8 bytes directly)
+    with fp.open("rb", buffering=READ_BUFFER) as f, out_fp.open("wb") as g:
+        for line in f:
+            raw = loads(line)
+            norm = normalize_one(raw, _REFMAP)
+            batch.append(dumps_line(norm))
+            if len(batch) >= WRITE_BATCH:
+                g.write(b"".join(batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            g.write(b"".join(batch))
+            count += len(batch)
+    return count
+
+def _list_raw_files(in_dir: Path) -> List[Path]:
+    """*.jsonl files in in_dir, sorted, from one os.scandir pass (cached d_type, no per-entry stat)."""
+    try:
+        with os.scandir(in_dir) as it:
+            return sorted(Path(e.path) for e in it if e.name.endswith(".jsonl") and e.is_file())
+    except FileNotFoundError:
+        return []
+
 def main():
     ap = argparse.ArgumentParser(description="Normalize raw events to Phase-0-compatible records with optional enrichments.")
     ap.add_argument("--once", action="store_true", help="Process all NDJSON in IN_DIR once and exit.")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Max worker processes across input files (1 = serial).")
     args = ap.parse_args()
     
     refmap = load_map()
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     
-    in_files = sorted(IN_DIR.glob("*.jsonl"))
-    total_out = 0
-    
-    for fp in in_files:
-        out_fp = OUT_DIR / fp.name.replace(".jsonl", ".norm.jsonl")
-        count = 0
-        with fp.open("r", encoding="utf-8") as f, out_fp.open("w", encoding="utf-8") as g:
-            for line in f:
-                raw = json.loads(line)
-                norm = normalize_one(raw, refmap)
-                g.write(json.dumps(norm, ensure_ascii=False) + "\n")
-                count += 1
-                total_out += 1
-        print(f"[NORMALIZE] {fp.name} -> {out_fp.name} ({count} items)")
-    
-    print(f"[NORMALIZE] wrote {total_out} normalized items")
+    in_files = _list_raw_files(IN_DIR)
+    workers = max(1, min(args.workers, len(in_files)))
+    
+    # Files are independent; fan out across processes when there is more than one
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(refmap,)) as ex:
+            counts = list(ex.map(_norm_file, in_files))
+    else:
+        _init_worker(refmap)
+        counts = [_norm_file(fp) for fp in in_files]
+    
+    for fp, count in zip(in_files, counts):
+        print(f"[NORMALIZE] {fp.name} -> {fp.name.replace('.jsonl', '.norm.jsonl')} ({count} items)")
+    
+    print(f"[NORMALIZE] wrote {sum(counts)} normalized items")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Convert dedupe state between JSONL and the compact binary format:
+- Loads SRC with the usual TTL window (expired entries are dropped)
+- Writes DST in the format given by its suffix ('.bin' = binary, else JSONL)
+- Point DEDUPE_STATE_FILE at DST afterwards
+"""
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from shared.dedupe import SeenStore
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("src", type=Path)
+    ap.add_argument("dst", type=Path)
+    ap.add_argument("--ttl-days", type=int, default=7)
+    args = ap.parse_args()
+
+    if not args.src.is_file():
+        sys.exit(f"Missing file: {args.src}")
+    if args.dst.exists():
+        sys.exit(f"Refusing to overwrite: {args.dst}")
+    with SeenStore(args.src, ttl_days=args.ttl_days) as store:
+        n = store.export(args.dst)
+    print(f"[DEDUPE] {args.src} -> {args.dst} ({n} active entries)")
+
+if __name__ == "__main__":
+    main()
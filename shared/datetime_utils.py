@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime, timezone
+from datetime import datetime, timezone, tzinfo
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 __all__ = ["parse_to_utc", "to_iso_utc", "STRICT_Z_ISO_PATTERN"]
@@ -10,11 +11,66 @@ __all__ = ["parse_to_utc", "to_iso_utc", "STRICT_Z_ISO_PATTERN"]
 # Strict pattern for final outputs: YYYY-MM-DDTHH:MM:SSZ
 STRICT_Z_ISO_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
 
+# Private ASCII-only twin for the parse fast path (\d alone also matches non-ASCII digits)
+_STRICT_Z_ASCII = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$", re.ASCII)
+
+# Fixed-layout RFC-2822 as sent by GMT feeds: 'Sun, 05 Oct 2025 06:20:00 GMT'
+_RFC2822_GMT = re.compile(r"^[A-Za-z]{3}, \d{2} [A-Za-z]{3} \d{4} \d{2}:\d{2}:\d{2} GMT$", re.ASCII)
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# _normalize_candidate rewrites, compiled once at import
+_SLASH_DATE = re.compile(r"^(\d{4})/(\d{2})/(\d{2})")
+_SPACE_SEP = re.compile(r"^(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}(?::\d{2})?)")
+_MISSING_SECONDS = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2})(?=(Z|[+-]\d{2}:?\d{2}|\s|$))")
+_COMPACT_OFFSET = re.compile(r"\s*([+-]\d{2})(\d{2})$")
+
+# Both parsers need at least one digit (year/day); anything without one is garbage
+_HAS_DIGIT = re.compile(r"\d")
+
 # Sanity window (inclusive lower bound, exclusive upper bound)
 _MIN_DT = datetime(2000, 1, 1, tzinfo=timezone.utc)
 _MAX_DT = datetime(2100, 1, 1, tzinfo=timezone.utc)
 
 
+# naive_tz name -> zone (None if the name is invalid), resolved once per name
+_TZ_CACHE: dict[str, tzinfo | None] = {}
+
+
+def _get_tz(name: str) -> tzinfo | None:
+    """ZoneInfo for name, memoized (including failures) to skip tzdata lookups."""
+    try:
+        return _TZ_CACHE[name]
+    except KeyError:
+        pass
+    try:
+        tz = ZoneInfo(name)
+    except Exception:
+        tz = None
+    _TZ_CACHE[name] = tz
+    return tz
+
+
+def _parse_rfc2822_gmt(s: str) -> datetime | None:
+    """Slice a fixed-layout RFC-2822 GMT date by offset; None if the shape or a field is off."""
+    if len(s) != 29 or s[3] != "," or not _RFC2822_GMT.match(s):
+        return None
+    month = _MONTHS.get(s[8:11].lower())
+    year = int(s[12:16])
+    if month is None or year < 100:
+        return None  # years < 100 get email.utils' two-digit-year mapping
+    try:
+        return datetime(
+            year, month, int(s[5:7]),
+            int(s[17:19]), int(s[20:22]), int(s[23:25]),
+            tzinfo=timezone.utc,
+        )
+    except ValueError:
+        return None  # e.g. day 31 in a 30-day month: let email.utils decide
+
+
 def _normalize_candidate(s: str) -> str:
     """
     Normalize common date-time quirks without changing semantics.
@@ -32,17 +88,17 @@ def _normalize_candidate(s: str) -> str:
         s = s[:-1] + "Z"
 
     # Convert leading slash date to dashes
-    s = re.sub(r"^(\d{4})/(\d{2})/(\d{2})", r"\1-\2-\3", s)
+    s = _SLASH_DATE.sub(r"\1-\2-\3", s)
 
     # Replace the first space between date and time with 'T' (HH:MM or HH:MM:SS)
-    s = re.sub(r"^(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}(?::\d{2})?)", r"\1T\2", s, count=1)
+    s = _SPACE_SEP.sub(r"\1T\2", s, count=1)
 
     # If ISO-like with missing seconds, add ':00' even if a TZ/space follows
     # e.g. '...T12:34Z', '...T12:34+0000', '...T12:34 +0000'
-    s = re.sub(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2})(?=(Z|[+-]\d{2}:?\d{2}|\s|$))", r"\1:00", s, count=1)
+    s = _MISSING_SECONDS.sub(r"\1:00", s, count=1)
 
     # Canonicalize '+HHMM' or ' +HHMM' to '+HH:MM' and drop the space
-    s = re.sub(r"\s*([+-]\d{2})(\d{2})$", r"\1:\2", s)
+    s = _COMPACT_OFFSET.sub(r"\1:\2", s)
 
     # If explicit 'Z', datetime.fromisoformat doesn't accept 'Z' -> use '+00:00'
     if s.endswith("Z"):
@@ -54,7 +110,9 @@ def _normalize_candidate(s: str) -> str:
 def parse_to_utc(dt_str: str, *, naive_tz: str | None = None) -> datetime:
     """
     Parse a datetime string tolerantly and return an aware UTC datetime.
-    Tries ISO (after normalization), then RFC-2822 (RSS).
+    Digit-leading input is tried as ISO (as-is, then normalized), then RFC-2822 (RSS);
+    anything else goes straight to RFC-2822.
+    Results (and failures) are memoized per (string, naive_tz): feeds repeat timestamps.
     If result is naive and naive_tz provided, localize then convert to UTC.
     Enforces sanity window [2000-01-01, 2100-01-01).
 
@@ -66,32 +124,60 @@ def parse_to_utc(dt_str: str, *, naive_tz: str | None = None) -> datetime:
     raw = str(dt_str).strip()
     if not raw:
         raise ValueError("missing")
+    # Cheap reject before the parsers (and before taking a cache slot)
+    if not _HAS_DIGIT.search(raw):
+        raise ValueError("unparseable")
+
+    dt = _parse_cached(raw, naive_tz)
+    if isinstance(dt, str):
+        raise ValueError(dt)
+    return dt
 
-    # Try ISO(-ish)
-    s = _normalize_candidate(raw)
+
+@lru_cache(maxsize=8192)
+def _parse_cached(raw: str, naive_tz: str | None) -> datetime | str:
+    """parse_to_utc body for a stripped, non-empty string; returns the error reason instead of raising."""
+    # Dispatch on the first character: ISO(-ish) starts with the year digit,
+    # RFC-2822/RSS usually with a weekday name (e.g., "Sun, 05 Oct 2025 06:20:00 GMT").
     dt = None
-    try:
-        dt = datetime.fromisoformat(s)
-    except Exception:
-        # Try RFC-2822/RSS (e.g., "Sun, 05 Oct 2025 06:20:00 GMT")
+    if _STRICT_Z_ASCII.match(raw):
+        # Already strict 'YYYY-MM-DDTHH:MM:SSZ': build it directly, skip normalization
+        try:
+            dt = datetime(
+                int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+                int(raw[11:13]), int(raw[14:16]), int(raw[17:19]),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass  # e.g. month 13: fall through to the tolerant path
+    if dt is None and raw[0].isdigit():
+        try:
+            # Already-valid ISO (e.g. '+00:00' offsets) parses as-is; the
+            # normalization rewrites only run for the quirky shapes
+            dt = datetime.fromisoformat(raw)
+        except ValueError:
+            try:
+                dt = datetime.fromisoformat(_normalize_candidate(raw))
+            except ValueError:
+                pass  # e.g. "05 Oct 2025 ..." (RFC-2822 without weekday)
+    if dt is None:
+        dt = _parse_rfc2822_gmt(raw)
+    if dt is None:
         try:
             dt = parsedate_to_datetime(raw)  # use raw here to respect 'GMT', etc.
         except Exception:
-            raise ValueError("unparseable")
+            return "unparseable"
 
     if dt.tzinfo is None:
         if naive_tz:
-            try:
-                dt = dt.replace(tzinfo=ZoneInfo(naive_tz))
-            except Exception:
-                dt = dt.replace(tzinfo=timezone.utc)
+            dt = dt.replace(tzinfo=_get_tz(naive_tz) or timezone.utc)
         else:
             dt = dt.replace(tzinfo=timezone.utc)
 
     dt_utc = dt.astimezone(timezone.utc)
 
     if not (_MIN_DT <= dt_utc < _MAX_DT):
-        raise ValueError("out_of_range")
+        return "out_of_range"
 
     return dt_utc
 
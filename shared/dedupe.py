@@ -1,28 +1,52 @@
 # shared/dedupe.py
 # Phase-1 MVP dedupe/idempotence helper.
-# - Hash key: source | title | first_url | YYYY-MM-DD (UTC)
+# - Hash key: source | title | first_url | YYYY-MM-DD (UTC), BLAKE2b-128
+#   (16-byte digest in memory, hex in the JSONL state file)
 # - Rolling TTL window (default 7 days).
 # - Append-only JSONL state at .state/seen_events.jsonl
+#   (appends may be batched and flushed with a single writev)
+# - Optional compact binary state: any state path ending in '.bin'
+#   (DEDUPE_STATE_FILE=.state/seen_events.bin); see _BIN_REC
 
 from __future__ import annotations
 
-import json
+import atexit
+import heapq
+import mmap
 import os
 import re
+import struct
 import unicodedata
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from hashlib import sha256
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
-from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+from typing import Dict, List, Optional, Tuple, Any
+from urllib.parse import urlsplit, urlunsplit, unquote, unquote_plus, quote_plus
+
+from shared.jsonl import dumps_line, loads
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: appends are unlocked
+    fcntl = None
+
+try:
+    from ciso8601 import parse_datetime as _ciso_parse
+except ImportError:  # optional C parser; stdlib fallback below
+    _ciso_parse = None
 
 # ---- Canonicalization helpers ------------------------------------------------
 
-_TRACKING_PARAMS = {
+# Query keys dropped from URLs: any utm_* plus these exact names
+_TRACKING_PREFIX = "utm_"
+_TRACKING_PARAMS = frozenset({
     "gclid", "fbclid", "igshid", "ref", "ref_src",
-}
+})
 
+# Canonicalizers are pure str -> str and see the same titles/URLs repeatedly
+@lru_cache(maxsize=200_000)
 def _casefold_trim(s: Optional[str]) -> str:
     if not s:
         return ""
@@ -31,44 +55,75 @@ def _casefold_trim(s: Optional[str]) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s.casefold()
 
+# RFC 3986 appendix B split: scheme, authority, path, query (fragment ignored).
+# Scheme must look like urlsplit's (alpha + alnum/'+-.') to be taken as one.
+_URI_RE = re.compile(r"^(?:([A-Za-z][A-Za-z0-9+.\-]*):)?(?://([^/?#]*))?([^?#]*)(?:\?([^#]*))?")
+# Characters quote_plus never escapes; components made only of these round-trip unchanged
+_QS_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.\-~]")
+_C0_OR_SPACE = "".join(map(chr, range(33)))
+
+def _requote(s: str) -> str:
+    # Same result as parse_qsl's unquote + urlencode's quote_plus, skipped when a no-op
+    if _QS_UNSAFE_RE.search(s) is None:
+        return s
+    return quote_plus(unquote_plus(s))
+
+@lru_cache(maxsize=200_000)
 def _normalize_url(url: Optional[str]) -> str:
     if not url:
         return ""
     try:
         # Percent-decode once to help normalize later
-        url = unquote(url)
-        parts = urlsplit(url)
-        scheme = (parts.scheme or "").lower()
-        netloc = (parts.netloc or "").lower()
+        if "%" in url:
+            url = unquote(url)
+        # Match urlsplit's input cleanup: leading C0/space and embedded tab/CR/LF
+        u = url.lstrip(_C0_OR_SPACE)
+        if "\t" in u or "\r" in u or "\n" in u:
+            u = u.replace("\t", "").replace("\r", "").replace("\n", "")
+        scheme, netloc, path, query = _URI_RE.match(u).groups()
+        scheme = (scheme or "").lower()
+        netloc = (netloc or "").lower()
+        if "[" in netloc or "]" in netloc:
+            urlsplit(u)  # IPv6 literal: let urlsplit validate (raises on malformed)
         if netloc.startswith("www."):
             netloc = netloc[4:]
 
-        # Drop fragment
-        fragment = ""
-
-        # Normalize query: drop utm_* and known trackers
-        query_pairs = []
-        for k, v in parse_qsl(parts.query, keep_blank_values=True):
-            k_low = k.casefold()
-            if k_low.startswith("utm_") or k_low in _TRACKING_PARAMS:
+        # Normalize query in one pass over 'k=v' pieces: drop utm_* and known trackers
+        kept = []
+        for piece in (query or "").split("&"):
+            if not piece:
                 continue
-            query_pairs.append((k, v))
-        query = urlencode(query_pairs, doseq=True)
+            k, sep, v = piece.partition("=")
+            if "%" in k or "+" in k:
+                k_low = unquote_plus(k)
+            else:
+                k_low = k
+            # casefold() == lower() for ASCII, and lower() is the cheaper call
+            k_low = k_low.lower() if k_low.isascii() else k_low.casefold()
+            if k_low in _TRACKING_PARAMS or k_low.startswith(_TRACKING_PREFIX):
+                continue
+            kept.append(_requote(k) + "=" + _requote(v))
+        query = "&".join(kept)
 
         # Normalize path: remove trailing slash if path is "/" only
-        path = parts.path or ""
         if path == "/":
             path = ""
 
-        return urlunsplit((scheme, netloc, path, query, fragment))
+        if not netloc:
+            # Rare (mailto:, relative, 'http:foo'): keep urlunsplit's exact rules
+            return urlunsplit((scheme, netloc, path, query, ""))
+        if path and path[0] != "/":
+            path = "/" + path
+        out = f"{scheme}://{netloc}{path}" if scheme else f"//{netloc}{path}"
+        return f"{out}?{query}" if query else out
     except Exception:
         # If anything goes wrong, return a safe fallback that still hashes deterministically
         return url.strip()
 
-def _pick_event_date(event: Dict[str, Any]) -> datetime:
+def _event_date(event: Dict[str, Any]) -> Optional[datetime]:
     """
-    Choose the datetime source in priority order and return an aware UTC datetime.
-    Priority: event_datetime_utc -> filing_datetime -> pubDate -> now (fallback).
+    Aware UTC datetime from the event's own fields, or None if missing/unparseable.
+    Priority: event_datetime_utc -> filing_datetime -> pubDate.
     """
     raw = (
         event.get("event_datetime_utc")
@@ -76,129 +131,347 @@ def _pick_event_date(event: Dict[str, Any]) -> datetime:
         or event.get("pubDate")
     )
     if raw:
-        dt = _parse_datetime_utc(raw)
-        if dt is not None:
-            return dt
+        return _parse_datetime_utc(raw)
+    return None
+
+def _pick_event_date(event: Dict[str, Any]) -> datetime:
+    """
+    Choose the datetime source in priority order and return an aware UTC datetime.
+    Priority: event_datetime_utc -> filing_datetime -> pubDate -> now (fallback).
+    """
+    dt = _event_date(event)
+    if dt is not None:
+        return dt
     # Explicit fallback to 'now' if everything missing/unparseable
     return datetime.now(timezone.utc)
 
 _ISO_Z_RE = re.compile(r"Z$", re.IGNORECASE)
+# Very small fallback set of common RFC822-like forms (RSS)
+_RFC822_FORMATS = ("%a, %d %b %Y %H:%M:%S %z", "%d %b %Y %H:%M:%S %z")
 
+def _fromisoformat_lenient(s: str) -> datetime:
+    # fromisoformat doesn't like 'Z'
+    s = _ISO_Z_RE.sub("+00:00", s)
+    # Allow space between date/time (e.g., "2025-10-04 12:00:00Z")
+    s = s.replace(" ", "T", 1) if " " in s and "T" not in s else s
+    return datetime.fromisoformat(s)
+
+@lru_cache(maxsize=65536)
 def _parse_datetime_utc(s: str) -> Optional[datetime]:
     """
     Tolerant ISO-8601-ish parsing to UTC-aware datetime.
     Assumes inputs are mostly normalized upstream; supports trailing 'Z' or offsets.
+    Uses ciso8601 (C parser) when installed, then fromisoformat, then RFC822.
+    Memoized: state files and event batches repeat the same timestamps.
     """
     if not s:
         return None
     s = s.strip()
-    try:
-        # fromisoformat doesn't like 'Z'
-        s = _ISO_Z_RE.sub("+00:00", s)
-        # Allow space between date/time (e.g., "2025-10-04 12:00:00Z")
-        s = s.replace(" ", "T", 1) if " " in s and "T" not in s else s
-        dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-    except Exception:
-        # Very small fallback set of common RFC822-like forms (RSS)
-        for fmt in ("%a, %d %b %Y %H:%M:%S %z", "%d %b %Y %H:%M:%S %z"):
-            try:
-                dt = datetime.strptime(s, fmt)
-                return dt.astimezone(timezone.utc)
-            except Exception:
-                continue
-    return None
+    dt = None
+    if _ciso_parse is not None:
+        try:
+            dt = _ciso_parse(s)  # accepts 'Z' and ' ' separator natively
+        except ValueError:
+            pass
+    if dt is None:
+        try:
+            dt = _fromisoformat_lenient(s)
+        except ValueError:
+            for fmt in _RFC822_FORMATS:
+                try:
+                    return datetime.strptime(s, fmt).astimezone(timezone.utc)
+                except ValueError:
+                    continue
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
 
 # ---- Public API --------------------------------------------------------------
 
-def make_hash(event: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
-    """
-    Compute the stable event hash and return (hash_hex, key_dict_for_debug).
-    Uses canonicalized source, title, first URL, and UTC date-only.
-    """
-    source = _casefold_trim(event.get("source") or event.get("source_name"))
-    title  = _casefold_trim(event.get("title") or event.get("headline"))
-
+def _first_url(event: Dict[str, Any]) -> Optional[str]:
     urls = event.get("urls")
-    first_url = (
+    return (
         event.get("first_url")
         or (urls[0] if isinstance(urls, list) and urls else None)
         or event.get("url")
     )
-    url_norm = _normalize_url(first_url)
 
-    dt = _pick_event_date(event)
-    date_str = dt.date().isoformat()
+def make_hash(event: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Compute the stable event hash and return (digest_bytes, key_dict_for_debug).
+    Uses canonicalized source, title, first URL, and UTC date-only.
+    Events carrying a precomputed '_dedupe_key' (see precompute_dedupe_key) skip
+    canonicalization and only hash.
+    """
+    pre = event.get("_dedupe_key")
+    if isinstance(pre, list) and len(pre) == 4:
+        source, title, url_norm, date_str = pre
+        h = _key_digest(f"{source}|{title}|{url_norm}|{date_str}")
+        return h, {"source": source, "title": title, "url": url_norm, "date": date_str}
 
-    key_str = f"{source}|{title}|{url_norm}|{date_str}"
-    h = sha256(key_str.encode("utf-8")).hexdigest()
+    dt = _pick_event_date(event)
+    h, (source, title, url_norm, date_str) = _hash_parts(
+        event.get("source") or event.get("source_name"),
+        event.get("title") or event.get("headline"),
+        _first_url(event),
+        dt.date().isoformat(),
+    )
     return h, {"source": source, "title": title, "url": url_norm, "date": date_str}
 
+def precompute_dedupe_key(event: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    Canonical [source, title, url, date] for make_hash, computed once upstream
+    (normalizer) and stored as event['_dedupe_key']. Returns None when the event
+    has no usable date: make_hash would fall back to 'now', which must be taken
+    at signal time, not at normalize time.
+    """
+    dt = _event_date(event)
+    if dt is None:
+        return None
+    _, parts = _hash_parts(
+        event.get("source") or event.get("source_name"),
+        event.get("title") or event.get("headline"),
+        _first_url(event),
+        dt.date().isoformat(),
+    )
+    return list(parts)
+
+@lru_cache(maxsize=100_000)
+def _hash_parts(source_raw: Optional[str], title_raw: Optional[str],
+                first_url: Optional[str], date_str: str) -> Tuple[bytes, Tuple[str, str, str, str]]:
+    """Canonicalize + hash the four raw identity fields (memoized)."""
+    source = _casefold_trim(source_raw)
+    title  = _casefold_trim(title_raw)
+    url_norm = _normalize_url(first_url)
+
+    h = _key_digest(f"{source}|{title}|{url_norm}|{date_str}")
+    return h, (source, title, url_norm, date_str)
+
+# State rows written with this version carry BLAKE2b hashes; older rows are SHA-256
+HASH_VERSION = 2
+
+def _key_digest(key_str: str) -> bytes:
+    # Non-cryptographic use: 128-bit BLAKE2b is ample for dedupe and cheaper than SHA-256.
+    # Raw 16-byte digest: half the size of hex as an _active key; hex only on disk (JSONL).
+    return blake2b(key_str.encode("utf-8"), digest_size=16).digest()
+
 @dataclass
 class SeenRecord:
-    hash: str
+    hash: bytes
     first_seen_utc: datetime
     last_seen_utc: datetime
     key: Dict[str, str]
 
+# Binary state record (little-endian), one per append:
+#   u32 record length (header + key bytes), u8 schema version (= HASH_VERSION),
+#   i64 first_seen / i64 last_seen as epoch microseconds UTC, 16-byte digest,
+#   u32 x4 byte lengths of the UTF-8 key parts (source, title, url, date), key parts.
+_BIN_REC = struct.Struct("<IBqq16sIIII")
+_KEY_FIELDS = ("source", "title", "url", "date")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+# Stores holding unflushed lines; one atexit hook flushes them all (a store
+# is only referenced here while it has pending data)
+_DIRTY_STORES: "set[SeenStore]" = set()
+
+def _flush_dirty_stores() -> None:
+    for store in list(_DIRTY_STORES):
+        store.flush()
+
+atexit.register(_flush_dirty_stores)
+
+def _encode_json(rec: SeenRecord) -> bytes:
+    return dumps_line({
+        "v": HASH_VERSION,
+        "hash": rec.hash.hex(),
+        "first_seen_utc": rec.first_seen_utc.isoformat(),
+        "last_seen_utc": rec.last_seen_utc.isoformat(),
+        "key": rec.key,
+    })
+
+def _encode_bin(rec: SeenRecord) -> bytes:
+    parts = [str(rec.key.get(k, "")).encode("utf-8") for k in _KEY_FIELDS]
+    head = _BIN_REC.pack(
+        _BIN_REC.size + sum(map(len, parts)), HASH_VERSION,
+        (rec.first_seen_utc - _EPOCH) // _US, (rec.last_seen_utc - _EPOCH) // _US,
+        rec.hash, *map(len, parts),
+    )
+    return head + b"".join(parts)
+
 class SeenStore:
     """
     Append-only JSONL dedupe store with an in-memory active window.
+
+    With batch_size > 1, appended lines are buffered and written with one
+    writev() per batch (or per 64 KiB); call flush() to make them visible to
+    other readers. batch_size=1 (default) writes through on every record().
+    The append handle is opened on the first write, so a store that only
+    reads (or is never used) leaves no state file behind.
     """
-    def __init__(self, state_path: Path, ttl_days: int = 7) -> None:
+    FLUSH_BYTES = 64 * 1024
+
+    def __init__(self, state_path: Path, ttl_days: int = 7, batch_size: int = 1) -> None:
         self.state_path = Path(state_path)
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(days=ttl_days)
-        self._active: Dict[str, SeenRecord] = {}
+        self.batch_size = max(1, batch_size)
+        self._active: Dict[bytes, SeenRecord] = {}
+        # (first_seen_utc, hash) min-heap for O(log n) TTL expiry
+        self._exp_heap: List[Tuple[datetime, bytes]] = []
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._binary = self.state_path.suffix == ".bin"
+        self._encode = _encode_bin if self._binary else _encode_json
         self._load_active()
+        self._exp_heap = [(rec.first_seen_utc, h) for h, rec in self._active.items()]
+        heapq.heapify(self._exp_heap)
+        self._fh = None  # opened lazily by flush()
+        self._closed = False
 
     @classmethod
-    def from_env(cls, default_path: str = ".state/seen_events.jsonl") -> "SeenStore":
+    def from_env(cls, default_path: str = ".state/seen_events.jsonl", batch_size: int = 1) -> "SeenStore":
         ttl_env = os.environ.get("DEDUPE_TTL_DAYS")
         try:
             ttl_days = int(ttl_env) if ttl_env is not None else 7
         except ValueError:
             ttl_days = 7
-        return cls(Path(default_path), ttl_days=ttl_days)
+        path = os.environ.get("DEDUPE_STATE_FILE") or default_path
+        return cls(Path(path), ttl_days=ttl_days, batch_size=batch_size)
 
     def _load_active(self) -> None:
         now = datetime.now(timezone.utc)
         if not self.state_path.exists():
             return
-        with self.state_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                    h = obj.get("hash")
-                    fs = obj.get("first_seen_utc")
-                    ls = obj.get("last_seen_utc") or fs
-                    key = obj.get("key") or {}
-                    if not h or not fs:
-                        continue
-                    first_seen = _parse_datetime_utc(fs) or now
-                    last_seen = _parse_datetime_utc(ls) or first_seen
-                    # Consider entry active if NOW - first_seen < TTL
-                    if now - first_seen < self.ttl:
-                        self._active[h] = SeenRecord(
-                            hash=h,
-                            first_seen_utc=first_seen,
-                            last_seen_utc=last_seen,
-                            key=key,
-                        )
-                except Exception:
-                    # Ignore bad lines; store remains usable
-                    continue
+        with self.state_path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            torn = False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if self._binary:
+                    good = self._scan_binary(mm, now)
+                    torn = good < len(mm)
+                elif not self._scan_reverse(mm, now):
+                    # Appends were not time-ordered (clock skew, foreign writer)
+                    self._active.clear()
+                    self._scan_forward(mm, now)
+        if torn:
+            # Partial record from an interrupted append: cut it so new appends stay readable
+            os.truncate(self.state_path, good)
+
+    def _scan_reverse(self, mm: mmap.mmap, now: datetime) -> bool:
+        """
+        Walk lines from EOF backwards and stop at the first line whose
+        last_seen_utc is older than the TTL cutoff: every earlier line was
+        appended before it, so nothing further back can still be active.
+        Returns False if an out-of-order pair is found.
+        """
+        cutoff = now - self.ttl
+        found: Dict[bytes, SeenRecord] = {}
+        newer: Optional[datetime] = None
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            line = mm[start:end]
+            end = start - 1
+            rec = self._parse_line(line, now)
+            if rec is None:
+                continue
+            if newer is not None and rec.last_seen_utc > newer:
+                return False
+            newer = rec.last_seen_utc
+            if rec.last_seen_utc <= cutoff:
+                break
+            # Newest line per hash wins (same as forward overwrite)
+            if rec.hash not in found and now - rec.first_seen_utc < self.ttl:
+                found[rec.hash] = rec
+        # Restore file (oldest-first) order
+        self._active.update(reversed(found.items()))
+        return True
 
-    def seen(self, h: str) -> bool:
+    def _scan_forward(self, mm: mmap.mmap, now: datetime) -> None:
+        for line in mm[:].split(b"\n"):
+            rec = self._parse_line(line, now)
+            # Consider entry active if NOW - first_seen < TTL
+            if rec is not None and now - rec.first_seen_utc < self.ttl:
+                self._active[rec.hash] = rec
+
+    def _scan_binary(self, mm: mmap.mmap, now: datetime) -> int:
+        """
+        Forward scan of fixed-header binary records; key parts are decoded only
+        for entries still inside the TTL window. Returns the offset after the
+        last whole record.
+        """
+        unpack = _BIN_REC.unpack_from
+        head = _BIN_REC.size
+        off, end = 0, len(mm)
+        while off + head <= end:
+            size, v, fs_us, ls_us, digest, *lens = unpack(mm, off)
+            if off + size > end:
+                break  # torn tail
+            if v != HASH_VERSION or size != head + sum(lens):
+                return end  # unknown schema / corrupt: keep what we have, don't truncate
+            first_seen = _EPOCH + fs_us * _US
+            if now - first_seen < self.ttl:
+                p = off + head
+                key = {}
+                for k, n in zip(_KEY_FIELDS, lens):
+                    key[k] = mm[p:p + n].decode("utf-8", "replace")
+                    p += n
+                self._active[digest] = SeenRecord(
+                    hash=digest,
+                    first_seen_utc=first_seen,
+                    last_seen_utc=_EPOCH + ls_us * _US,
+                    key=key,
+                )
+            off += size
+        return off
+
+    @staticmethod
+    def _parse_line(line: bytes, now: datetime) -> Optional[SeenRecord]:
+        if not line.strip():
+            return None
+        try:
+            obj = loads(line)
+            h = obj.get("hash")
+            fs = obj.get("first_seen_utc")
+            ls = obj.get("last_seen_utc") or fs
+            if not h or not fs:
+                return None
+            key = obj.get("key") or {}
+            if obj.get("v") == HASH_VERSION:
+                h = bytes.fromhex(h)
+            else:
+                # Legacy SHA-256 row: re-key from the stored canonical parts;
+                # an incomplete key could never match again, so the row is dropped
+                h = _key_digest(f"{key['source']}|{key['title']}|{key['url']}|{key['date']}")
+            first_seen = _parse_datetime_utc(fs) or now
+            last_seen = _parse_datetime_utc(ls) or first_seen
+            return SeenRecord(
+                hash=h,
+                first_seen_utc=first_seen,
+                last_seen_utc=last_seen,
+                key=key,
+            )
+        except Exception:
+            # Ignore bad lines; store remains usable
+            return None
+
+    def _evict_expired(self, now: datetime) -> None:
+        """Drop entries whose first_seen is past the TTL (heap head first)."""
+        heap = self._exp_heap
+        while heap and now - heap[0][0] >= self.ttl:
+            _, h = heapq.heappop(heap)
+            self._active.pop(h, None)
+
+    def seen(self, h: bytes) -> bool:
+        self._evict_expired(datetime.now(timezone.utc))
         return h in self._active
 
-    def record(self, h: str, key: Dict[str, str]) -> None:
+    def record(self, h: bytes, key: Dict[str, str]) -> None:
         now_dt = datetime.now(timezone.utc)
+        self._evict_expired(now_dt)
         rec = self._active.get(h)
         if rec is None:
             self._active[h] = SeenRecord(
@@ -207,35 +480,93 @@ class SeenStore:
                 last_seen_utc=now_dt,
                 key=key,
             )
+            heapq.heappush(self._exp_heap, (now_dt, h))
         else:
             rec.last_seen_utc = now_dt
 
-        # Append-only write (line-buffered)
-        payload = {
-            "hash": h,
-            "first_seen_utc": self._active[h].first_seen_utc.isoformat(),
-            "last_seen_utc": self._active[h].last_seen_utc.isoformat(),
-            "key": key,
-        }
-        with self.state_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        # Append-only write (batched; flushed by size/count)
+        line = self._encode(self._active[h])
+        if not self._pending:
+            _DIRTY_STORES.add(self)
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        if len(self._pending) >= self.batch_size or self._pending_bytes >= self.FLUSH_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered lines to the state file in one writev()."""
+        if not self._pending or self._closed:
+            return
+        if self._fh is None:
+            self._fh = open(self.state_path, "ab", buffering=0)
+        fd = self._fh.fileno()
+        # Exclusive lock so concurrent stages never interleave partial lines
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if hasattr(os, "writev"):
+                written = os.writev(fd, self._pending)
+                if written < self._pending_bytes:
+                    # Short write: push out the remainder
+                    rest = memoryview(b"".join(self._pending))[written:]
+                    while rest:
+                        rest = rest[os.write(fd, rest):]
+            else:
+                self._fh.write(b"".join(self._pending))
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        self._pending.clear()
+        self._pending_bytes = 0
+        _DIRTY_STORES.discard(self)
+
+    def close(self) -> None:
+        """Flush pending lines and release the append handle."""
+        self.flush()
+        self._closed = True
+        _DIRTY_STORES.discard(self)
+        if self._fh is not None:
+            self._fh.close()
+
+    def __enter__(self) -> "SeenStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _write_active(self, path: Path, encode) -> int:
+        with path.open("wb") as f:
+            # Oldest-first by last_seen keeps the file ordered for the reverse load scan
+            recs = sorted(self._active.values(), key=lambda r: r.last_seen_utc)
+            f.write(b"".join(map(encode, recs)))
+        return len(recs)
 
     def compact(self) -> None:
         """
-        Rewrite state file with only active entries. Safe atomic rename.
+        Rewrite state file with only active entries (expired ones are evicted
+        first). Safe atomic rename.
         """
+        # Buffered lines are already reflected in _active; the rewrite covers them
+        self._pending.clear()
+        self._pending_bytes = 0
+        _DIRTY_STORES.discard(self)
         tmp = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
-        now = datetime.now(timezone.utc)
-        with tmp.open("w", encoding="utf-8") as f:
-            for rec in self._active.values():
-                if now - rec.first_seen_utc < self.ttl:
-                    f.write(json.dumps({
-                        "hash": rec.hash,
-                        "first_seen_utc": rec.first_seen_utc.isoformat(),
-                        "last_seen_utc": rec.last_seen_utc.isoformat(),
-                        "key": rec.key,
-                    }, ensure_ascii=False) + "\n")
+        self._evict_expired(datetime.now(timezone.utc))
+        self._write_active(tmp, self._encode)
         tmp.replace(self.state_path)
+        # The old handle points at the replaced inode; the next flush reopens
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def export(self, path: Path) -> int:
+        """
+        Write active entries to path, JSONL or binary by its suffix ('.bin').
+        Used to convert state between formats; returns the entry count.
+        """
+        path = Path(path)
+        self._evict_expired(datetime.now(timezone.utc))
+        return self._write_active(path, _encode_bin if path.suffix == ".bin" else _encode_json)
 
 def dedupe_disabled() -> bool:
     return os.environ.get("DEDUPE_DISABLE") == "1"
@@ -8,8 +8,16 @@ from urllib.parse import urlparse
 
 # Simple header cache used by PR & EDGAR ingesters.
 # Stores per-URL: etag, last_modified, fetched
+# The file is rewritten only when a validator changes (unchanged feeds cost no IO).
 
 def is_http(url: str) -> bool:
+    if not isinstance(url, str):
+        return False
+    # Fast path: plain scheme-prefix check (no ParseResult). urlparse strips
+    # leading space/C0 chars and tab/CR/LF anywhere, so let it decide those.
+    head = url[:6]
+    if url[:1] > " " and "\t" not in head and "\r" not in head and "\n" not in head:
+        return head.lower().startswith(("http:", "https:"))
     try:
         return urlparse(url).scheme.lower() in ("http", "https")
     except Exception:
@@ -60,18 +68,28 @@ def extract_http_metadata(parsed: Any) -> Dict[str, Optional[str]]:
         "content_type": ctype,
     }
 
-def update_cache_from_parsed(url: str, parsed: Any, cache: Dict[str, Dict[str, str]], now_ts: str) -> None:
+def update_cache_from_parsed(url: str, parsed: Any, cache: Dict[str, Dict[str, str]], now_ts: str) -> bool:
+    """
+    Store the response validators for url. Returns True if etag/last_modified
+    changed, i.e. the cache file needs rewriting; a refreshed 'fetched' alone
+    does not (it records when validators were last stored).
+    """
     if not is_http(url):
-        return
+        return False
     meta = extract_http_metadata(parsed)
     etag = meta.get("etag")
     lm = meta.get("last_modified")
     if not (etag or lm):
-        return
+        return False
     rec = cache.get(url, {})
-    if etag:
+    changed = url not in cache
+    if etag and rec.get("etag") != etag:
         rec["etag"] = etag
-    if lm:
+        changed = True
+    if lm and rec.get("last_modified") != lm:
         rec["last_modified"] = lm
-    rec["fetched"] = now_ts
+        changed = True
+    if changed:
+        rec["fetched"] = now_ts
     cache[url] = rec
+    return changed
@@ -0,0 +1,66 @@
+# shared/jsonl.py
+# NDJSON encode/decode helpers shared by the pipeline stages.
+# - Uses orjson when installed (bytes out, UTF-8 already encoded).
+# - Falls back to stdlib json (ensure_ascii=False) when orjson is missing, and
+#   per call for inputs orjson handles differently, so both paths agree:
+#     * loads: NaN/Infinity tokens (orjson rejects them) and integers beyond
+#       64 bits (orjson would return floats) are parsed by json.loads.
+#     * dumps_line: integers beyond 64 bits (orjson raises) go through json.dumps.
+# - One remaining difference: dumps_line writes float NaN/Infinity as null
+#   with orjson, but as the non-standard NaN/Infinity tokens with stdlib json.
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib path is always available
+    orjson = None
+
+__all__ = ["dumps_line", "loads"]
+
+
+def _dumps_line_stdlib(obj: Any) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+if orjson is not None:
+    _OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+    # A run of 19+ digits may be an integer orjson cannot hold exactly (|n| >= 2**63
+    # has 19 digits); false hits inside strings/floats just take the stdlib path.
+    # Checked as: every digit -> '1' (translate, in C), then a substring test.
+    _DIGITS_TO_ONE = bytes.maketrans(b"023456789", b"111111111")
+    _LONG_RUN = b"1" * 19
+
+    def _has_long_digit_run(line: Union[bytes, str]) -> bool:
+        if isinstance(line, str):
+            line = line.encode("utf-8", "surrogatepass")
+        return _LONG_RUN in line.translate(_DIGITS_TO_ONE)
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj as one UTF-8 NDJSON line (with trailing newline)."""
+        try:
+            return orjson.dumps(obj, option=_OPTS)
+        except TypeError:
+            # e.g. 'Integer exceeds 64-bit range'; unsupported types still raise below
+            return _dumps_line_stdlib(obj)
+
+    def loads(line: Union[bytes, str]) -> Any:
+        """Parse one JSON document from bytes or str."""
+        if _has_long_digit_run(line):
+            return json.loads(line)
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity as written by json.dumps; truly bad input raises from json.loads
+            return json.loads(line)
+else:
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj as one UTF-8 NDJSON line (with trailing newline)."""
+        return _dumps_line_stdlib(obj)
+
+    def loads(line: Union[bytes, str]) -> Any:
+        """Parse one JSON document from bytes or str."""
+        return json.loads(line)
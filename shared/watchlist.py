@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import os
-import re
 import logging
+import string
 import yaml
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple, Set, Dict, Any, List
+from typing import Optional, Tuple, Set, FrozenSet, Dict, Any, List
 
 _LOG = logging.getLogger(__name__)
 
-_CIK_RE = re.compile(r"^\s*\d+\s*$")
-_TICKER_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9\.\-]{0,9}$")  # simple, permissive
+# Ticker: alnum first, then alnum/'.'/'-', at most 10 chars (simple, permissive)
+_TICKER_HEAD = frozenset(string.ascii_uppercase + string.digits)
+_TICKER_CHARS = _TICKER_HEAD | frozenset(".-")
 
 
 def _canon_ticker(tok: str) -> Optional[str]:
@@ -19,17 +21,24 @@ def _canon_ticker(tok: str) -> Optional[str]:
     if not t:
         return None
     # Keep '.' and '-' literal (e.g., BRK.B, RDS-A)
-    if _TICKER_RE.match(t):
-        return t
-    return None
+    if len(t) > 10 or t[0] not in _TICKER_HEAD:
+        return None
+    for ch in t:
+        if ch not in _TICKER_CHARS:
+            return None
+    return t
 
 
 def _canon_cik(tok: str) -> Optional[str]:
     t = tok.strip()
-    if not _CIK_RE.match(t):
+    if not t.isdecimal():  # same set as regex \d
         return None
+    if t.isascii():
+        # ASCII digits: pad directly, no int round-trip (leading zeros dropped
+        # first so over-padded inputs canonicalize like int() would)
+        return t.lstrip("0").zfill(10)
     try:
-        return f"{int(t):010d}"
+        return f"{int(t):010d}"  # non-ASCII Unicode digits
     except Exception:
         return None
 
@@ -67,12 +76,31 @@ def _extract_identifiers(event: Dict[str, Any]) -> Tuple[Optional[str], Optional
     return ticker, cik
 
 
+def precompute_ids(event: Dict[str, Any]) -> List[Optional[str]]:
+    """
+    [ticker_norm, cik_norm_10digits] for event['_ids'], computed once upstream
+    (normalizer) so Watchlist.allowed can skip _extract_identifiers.
+    """
+    t, c = _extract_identifiers(event)
+    return [t, c]
+
+
 @dataclass
 class Watchlist:
-    tickers: Set[str] = field(default_factory=set)  # canonical uppercase
-    ciks: Set[str] = field(default_factory=set)     # 10-digit strings
-    sectors: Set[str] = field(default_factory=set)  # M7: sector filter
-    tags: Set[str] = field(default_factory=set)     # M7: tag filter
+    tickers: FrozenSet[str] = field(default_factory=frozenset)  # canonical uppercase
+    ciks: FrozenSet[str] = field(default_factory=frozenset)     # 10-digit strings
+    sectors: FrozenSet[str] = field(default_factory=frozenset)  # M7: sector filter
+    tags: FrozenSet[str] = field(default_factory=frozenset)     # M7: tag filter
+    _allow_all: bool = field(init=False, repr=False, compare=False, default=True)
+
+    def __post_init__(self) -> None:
+        # Immutable after load; builders may pass plain sets
+        self.tickers = frozenset(self.tickers)
+        self.ciks = frozenset(self.ciks)
+        self.sectors = frozenset(self.sectors)
+        self.tags = frozenset(self.tags)
+        # No selectors at all => everything passes (decided once, not per event)
+        self._allow_all = not (self.tickers or self.ciks or self.sectors or self.tags)
 
     @classmethod
     def from_file(cls, path: Path) -> "Watchlist":
@@ -156,11 +184,15 @@ class Watchlist:
     def allowed(self, event: Dict[str, Any]) -> bool:
         """Check if event matches any watchlist selector"""
         # If no selectors defined, allow all
-        if not (self.tickers or self.ciks or self.sectors or self.tags):
+        if self._allow_all:
             return True
         
-        # Check ticker/CIK (legacy)
-        t, c = _extract_identifiers(event)
+        # Check ticker/CIK (legacy); normalizer-precomputed '_ids' when present
+        ids = event.get("_ids")
+        if isinstance(ids, list) and len(ids) == 2:
+            t, c = ids
+        else:
+            t, c = _extract_identifiers(event)
         if t and t in self.tickers:
             return True
         if c and c in self.ciks:
@@ -196,6 +228,21 @@ def load_watchlist(path: str) -> Watchlist:
         return Watchlist.from_file(p)
 
 
+@lru_cache(maxsize=8)
+def _load_watchlist_keyed(path: str, mtime_ns: int, size: int) -> Watchlist:
+    return load_watchlist(path)
+
+
+def _load_watchlist_cached(path: str) -> Watchlist:
+    """load_watchlist memoized on (abs path, mtime, size): one stat instead of a re-parse."""
+    p = os.path.abspath(path)
+    try:
+        st = os.stat(p)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Watchlist file not found: {Path(path)}") from None
+    return _load_watchlist_keyed(p, st.st_mtime_ns, st.st_size)
+
+
 def infer_watchlist(cli_path: Optional[str]) -> Optional[Watchlist]:
     """
     Resolution:
@@ -207,6 +254,8 @@ def infer_watchlist(cli_path: Optional[str]) -> Optional[Watchlist]:
       - else => disabled
     Failure policy:
       - If resolved path does not exist => raise FileNotFoundError
+    The parsed file is memoized per process until it changes on disk
+    (mtime/size), so long-running callers do not re-read it each time.
     """
     if os.environ.get("WATCHLIST_DISABLE") == "1":
         return None
@@ -241,4 +290,4 @@ def infer_watchlist(cli_path: Optional[str]) -> Optional[Watchlist]:
     if not path:
         return None  # not enabled
 
-    return load_watchlist(path)
+    return _load_watchlist_cached(path)
@@ -1,8 +1,12 @@
 import os
 import sys
-import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from shared.jsonl import dumps_line, loads
 from shared.watchlist import infer_watchlist
 
 from .rules_sec_pr import hit_tags
@@ -11,7 +15,59 @@ from .scorer import score_hits
 # Dedupe helpers
 from shared.dedupe import make_hash, SeenStore, dedupe_disabled
 
-def main():
+# Lines parsed per batch before running the gates
+READ_CHUNK = 8192
+
+# Normalizer-private fields consumed by the gates; never written to signals
+_PRIVATE_FIELDS = ("_dedupe_key", "_ids")
+
+def _scan_file(fp: Path, watchlist, threshold: int) -> Tuple[int, List[Tuple[bytes, Dict[str, str], bytes]]]:
+    """
+    Per-file CPU work (parse, watchlist, rules, score, hash); no dedupe state.
+    Returns (skipped_unwatched, candidates) where candidates are
+    (hash, key, signal_line) in input order, for the caller to dedupe.
+    """
+    skipped_unwatched = 0
+    candidates: List[Tuple[bytes, Dict[str, str], bytes]] = []
+    append = candidates.append
+    allowed = watchlist.allowed if watchlist is not None else None
+
+    with fp.open("r", encoding="utf-8") as f_in:
+        # Parse in chunks, then run the gates over the parsed batch
+        while True:
+            chunk = list(islice(f_in, READ_CHUNK))
+            if not chunk:
+                break
+            events = [loads(line) for line in chunk if line.strip()]
+
+            for d in events:
+                # --- Watchlist gate (runs BEFORE scoring & dedupe) ---
+                if allowed is not None and not allowed(d):
+                    skipped_unwatched += 1
+                    continue
+                # -----------------------------------------------------
+
+                # Gates in cost order: keyword scan, then score, then hash
+                get = d.get
+                hits = hit_tags(get("title"), get("body"))
+                if not hits:
+                    continue
+                s = score_hits(hits, get("event_kind"), get("event_subtype"))
+
+                if s >= threshold:
+                    # Compute hash *only* when the item would be emitted
+                    h, key = make_hash(d)
+                    # Emitted signals keep the event schema
+                    for k in _PRIVATE_FIELDS:
+                        d.pop(k, None)
+                    # Signal = event fields + score/hits; d is not reused, so no copy
+                    d["score"] = s
+                    d["rule_hits"] = hits
+                    append((h, key, dumps_line(d)))
+
+    return skipped_unwatched, candidates
+
+def main(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser(description="Detect signals from normalized events.")
     ap.add_argument("--threshold", type=int, default=3, help="Minimum score to emit a signal")
     # Optional PATH; presence enables watchlist feature
@@ -22,7 +78,9 @@ def main():
         metavar="PATH",
         help="Enable watchlist filter (optional PATH). If omitted, uses WATCHLIST_FILE env or ref/watchlist.txt."
     )
-    args = ap.parse_args()
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                    help="Max worker processes across input files (1 = serial).")
+    args = ap.parse_args(argv)
 
     # Resolve watchlist ONCE at startup
     WATCHLIST = None
@@ -42,74 +100,71 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
 
     # Initialize dedupe store (respects DEDUPE_TTL_DAYS; can be bypassed via DEDUPE_DISABLE=1)
-    store = SeenStore.from_env()
     use_dedupe = not dedupe_disabled()
+    store = SeenStore.from_env(batch_size=256) if use_dedupe else None
 
     total_emitted_global = 0
     total_skipped_dupes_global = 0
     total_skipped_unwatched_global = 0
 
-    for fp in sorted(in_dir.glob("*.norm.jsonl")):
-        out_fp = out_dir / fp.name.replace(".norm.jsonl", ".signals.jsonl")
-        emitted = 0
-        skipped_dupes = 0
-        skipped_unwatched = 0
+    in_files = sorted(in_dir.glob("*.norm.jsonl"))
+    workers = max(1, min(args.workers, len(in_files)))
+    n = len(in_files)
 
-        with fp.open("r", encoding="utf-8") as f_in, out_fp.open("w", encoding="utf-8") as f_out:
-            for line in f_in:
-                if not line.strip():
-                    continue
-                d = json.loads(line)
-
-                # --- Watchlist gate (runs BEFORE scoring & dedupe) ---
-                if WATCHLIST is not None:
-                    if not WATCHLIST.allowed(d):
-                        skipped_unwatched += 1
-                        continue
-                # -----------------------------------------------------
-
-                text = " ".join(filter(None, [d.get("title"), d.get("body")]))
-                hits = hit_tags(text)
-                s = score_hits(hits, d.get("event_kind"), d.get("event_subtype"))
-
-                if s >= args.threshold and hits:
-                    # Compute hash *only* when the item would be emitted
-                    h, key = make_hash(d)
-
-                    if use_dedupe and store.seen(h):
+    # Files are scanned in parallel; dedupe runs here, in file order, so results
+    # match a serial run (a hash emitted by an earlier file suppresses later ones)
+    with ExitStack() as stack:
+        if workers > 1:
+            ex = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            scans = ex.map(_scan_file, in_files, [WATCHLIST] * n, [args.threshold] * n)
+        else:
+            scans = (_scan_file(fp, WATCHLIST, args.threshold) for fp in in_files)
+
+        for fp, (skipped_unwatched, candidates) in zip(in_files, scans):
+            out_fp = out_dir / fp.name.replace(".norm.jsonl", ".signals.jsonl")
+            emitted = 0
+            skipped_dupes = 0
+
+            with out_fp.open("wb") as f_out:
+                write = f_out.write
+                if use_dedupe:
+                    seen, record = store.seen, store.record
+                for h, key, line in candidates:
+                    if use_dedupe and seen(h):
                         skipped_dupes += 1
                         continue
 
-                    sig = dict(d)  # Start with all event fields
-                    sig["score"] = s
-                    sig["rule_hits"] = hits
-                    f_out.write(json.dumps(sig, ensure_ascii=False) + "\n")
+                    write(line)
                     emitted += 1
 
                     if use_dedupe:
-                        store.record(h, key)
-
-        total_emitted_global += emitted
-        total_skipped_dupes_global += skipped_dupes
-        total_skipped_unwatched_global += skipped_unwatched
-
-        # Build note string
-        details = []
-        if use_dedupe:
-            details.append(f"skipped_dupes={skipped_dupes}")
-        else:
-            details.append("dedupe=DISABLED")
-        details.append(f"skipped_unwatched={skipped_unwatched}")
-
-        print(f"[SIGNALS] {fp.name} -> {out_fp.name} (emitted={emitted} >= {args.threshold}; " + "; ".join(details) + ")")
-
-    # Optional lightweight auto-compaction if state grows large
-    try:
-        state_path = store.state_path  # attribute exists on SeenStore
-        if state_path.exists() and state_path.stat().st_size > 5_000_000:  # ~5 MB
-            store.compact()
-    except Exception:
-        pass
+                        record(h, key)
+
+            total_emitted_global += emitted
+            total_skipped_dupes_global += skipped_dupes
+            total_skipped_unwatched_global += skipped_unwatched
+
+            # Build note string
+            details = []
+            if use_dedupe:
+                details.append(f"skipped_dupes={skipped_dupes}")
+            else:
+                details.append("dedupe=DISABLED")
+            details.append(f"skipped_unwatched={skipped_unwatched}")
+
+            print(f"[SIGNALS] {fp.name} -> {out_fp.name} (emitted={emitted} >= {args.threshold}; " + "; ".join(details) + ")")
+
+    if store is not None:
+        store.flush()
+
+        # Optional lightweight auto-compaction if state grows large
+        try:
+            state_path = store.state_path  # attribute exists on SeenStore
+            if state_path.exists() and state_path.stat().st_size > 5_000_000:  # ~5 MB
+                store.compact()
+        except Exception:
+            pass
+        store.close()
 
     if use_dedupe:
         print(f"[SIGNALS] totals: emitted={total_emitted_global}, skipped_dupes={total_skipped_dupes_global}, skipped_unwatched={total_skipped_unwatched_global}")
@@ -7,18 +7,18 @@ Analyzes:
 - Recent divergences (when correlated pairs break pattern)
 - Leading indicators (which stocks predict others)
 """
-import json
 import argparse
 import csv
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
 import warnings
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
 
+from shared.jsonl import dumps_line
+
 warnings.filterwarnings('ignore')
 
 
@@ -55,30 +55,50 @@ def fetch_price_data(tickers: List[str], days: int = 90) -> pd.DataFrame:
     
     print(f"[CORRELATION] Fetching {days} days of price data for {len(tickers)} tickers...")
     
-    price_data = {}
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return pd.DataFrame()
+    
+    # Network dependency, only needed for live fetches (the analytics below are pure pandas/numpy)
+    import yfinance as yf
+    
+    # One batched, threaded request for all symbols instead of one round-trip per ticker.
+    # auto_adjust=True matches Ticker.history() prices.
+    try:
+        hist = yf.download(tickers, start=start_date, end=end_date, auto_adjust=True,
+                           progress=False, threads=True)
+    except Exception as e:
+        print(f"[CORRELATION]   batch download error - {e}")
+        return pd.DataFrame()
+    
+    if hist is None or hist.empty:
+        return pd.DataFrame()
+    
+    close = hist['Close']
+    if isinstance(close, pd.Series):  # single symbol without a ticker column level
+        close = close.to_frame(tickers[0])
     
+    # Keep universe order; report symbols that came back empty
+    counts = close.count()
+    price_cols = []
     for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start_date, end=end_date)
-            
-            if len(hist) > 0:
-                # Use close price, forward-fill missing data
-                price_data[ticker] = hist['Close']
-                print(f"[CORRELATION]   {ticker}: {len(hist)} days")
-            else:
-                print(f"[CORRELATION]   {ticker}: No data")
-        except Exception as e:
-            print(f"[CORRELATION]   {ticker}: Error - {e}")
+        n = int(counts.get(ticker, 0))
+        if n > 0:
+            price_cols.append(ticker)
+            print(f"[CORRELATION]   {ticker}: {n} days")
+        else:
+            print(f"[CORRELATION]   {ticker}: No data")
     
-    if not price_data:
+    if not price_cols:
         return pd.DataFrame()
     
-    # Combine into single DataFrame
-    df = pd.DataFrame(price_data)
+    # Tickers as columns, union of their trading dates as index
+    df = close[price_cols].dropna(how='all')
     
-    # Forward-fill missing values (for holidays/weekends)
-    df = df.fillna(method='ffill')
+    # Forward-fill missing values (for holidays/weekends); in place on the
+    # frame dropna() just produced, so no second copy. Leading all-NaN rows
+    # are already gone, so ffill cannot leave any behind.
+    df.ffill(inplace=True)
     
     return df
 
@@ -88,34 +108,151 @@ def calculate_returns(prices: pd.DataFrame) -> pd.DataFrame:
     return prices.pct_change().dropna()
 
 
-def calculate_correlation_matrix(returns: pd.DataFrame) -> pd.DataFrame:
-    """Calculate Pearson correlation matrix."""
-    return returns.corr()
+def calculate_correlation_matrix(returns: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    """
+    Calculate Pearson correlation matrix.
+    
+    dtype=np.float32 halves the memory traffic of the dense path on wide
+    universes; results are then good to ~1e-6, not float64's ~1e-15.
+    """
+    arr = returns.to_numpy(dtype=dtype)
+    # Degenerate shapes or gaps: keep pandas' pairwise-NaN semantics
+    if arr.shape[0] < 2 or arr.shape[1] < 2 or np.isnan(arr).any():
+        return returns.corr()
+    # calculate_returns already dropped NaN rows: one dense corrcoef call
+    C = np.corrcoef(arr, rowvar=False, dtype=dtype)
+    return pd.DataFrame(C, index=returns.columns, columns=returns.columns)
 
 
-def find_strong_correlations(corr_matrix: pd.DataFrame, threshold: float = 0.7) -> List[Dict]:
+class RollingCorrelation:
+    """
+    Pearson correlation over a sliding window of daily returns, kept as
+    sufficient statistics (n, sum x, sum x*y) so that new days cost O(k*N^2)
+    instead of a full O(T*N^2) recompute: add incoming rows, subtract the
+    rows that fall out of the window. Window rows are kept to know what leaves.
+    """
+    REFRESH_EVERY = 64  # full re-sum from the window rows to bound float drift
+    
+    def __init__(self, tickers: List[str], dates, rows, updates: int = 0):
+        self.tickers = list(tickers)
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")
+        self.rows = np.asarray(rows, dtype=np.float64)
+        self.window = len(self.rows)
+        self.updates = updates
+        self._resum()
+    
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame) -> "RollingCorrelation":
+        return cls(returns.columns.tolist(), _index_ns(returns.index), returns.to_numpy(dtype=np.float64))
+    
+    def _resum(self) -> None:
+        self.sx = self.rows.sum(axis=0)
+        self.sxy = self.rows.T @ self.rows
+    
+    def update(self, returns: pd.DataFrame) -> int:
+        """Slide the window over return rows newer than the last stored day; returns rows added."""
+        new = returns.reindex(columns=self.tickers)
+        if len(self.dates):
+            new = new[_index_ns(new.index) > self.dates[-1]]
+        new = new.dropna()
+        if new.empty:
+            return 0
+        add = new.to_numpy(dtype=np.float64)
+        rows = np.vstack([self.rows, add])
+        drop = max(0, len(rows) - self.window)
+        out = rows[:drop]
+        self.rows = rows[drop:]
+        self.dates = np.concatenate([self.dates, _index_ns(new.index)])[drop:]
+        self.updates += 1
+        if drop >= self.window or self.updates % self.REFRESH_EVERY == 0:
+            self._resum()
+        else:
+            self.sx += add.sum(axis=0) - out.sum(axis=0)
+            self.sxy += add.T @ add - out.T @ out
+        return len(add)
+    
+    def matrix(self) -> pd.DataFrame:
+        """Correlation matrix from the aggregates (NaN for constant series, as DataFrame.corr)."""
+        n = len(self.rows)
+        sxx = np.diag(self.sxy)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = n * sxx - self.sx ** 2
+            # Zero variance up to cancellation error -> undefined correlation
+            sd = np.where(var > 1e-12 * n * sxx, np.sqrt(np.maximum(var, 0.0)), np.nan)
+            C = (n * self.sxy - np.outer(self.sx, self.sx)) / sd[:, None] / sd[None, :]
+        C = np.clip(C, -1.0, 1.0)
+        return pd.DataFrame(C, index=self.tickers, columns=self.tickers)
+    
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(f, tickers=np.array(self.tickers), dates=self.dates, rows=self.rows,
+                     sx=self.sx, sxy=self.sxy, updates=np.int64(self.updates))
+        tmp.replace(path)
+    
+    @classmethod
+    def load(cls, path: Path) -> "RollingCorrelation":
+        with np.load(path) as z:
+            obj = cls.__new__(cls)
+            obj.tickers = z["tickers"].tolist()
+            obj.dates = z["dates"]
+            obj.rows = z["rows"]
+            obj.window = len(obj.rows)
+            obj.sx = z["sx"]
+            obj.sxy = z["sxy"]
+            obj.updates = int(z["updates"])
+        return obj
+
+
+def _index_ns(index: pd.Index) -> np.ndarray:
+    """DatetimeIndex -> naive UTC datetime64[ns] (tz-aware indexes converted first)."""
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        idx = idx.tz_convert("UTC").tz_localize(None)
+    return idx.values.astype("datetime64[ns]")
+
+
+def find_strong_correlations(corr_matrix: pd.DataFrame, threshold: float = 0.7,
+                             top_k: Optional[int] = None) -> List[Dict]:
     """
     Find ticker pairs with strong correlation (positive or negative).
     
+    With top_k, only the top_k strongest pairs are returned, ranked by |correlation|.
+    
     Returns list of correlation pairs.
     """
-    correlations = []
-    
     tickers = corr_matrix.columns.tolist()
+    arr = corr_matrix.to_numpy(dtype=np.float64)
+    
+    # Upper triangle (each pair once, same order as a nested i<j loop)
+    iu, ju = np.triu_indices(len(tickers), k=1)
+    vals = arr[iu, ju]
+    
+    # Strong positive or negative correlation (NaN never passes)
+    sel = np.flatnonzero(np.abs(vals) >= threshold)
+    
+    if top_k is not None:
+        # Partition out the top_k hits, then rank only those (ties keep pair order)
+        mag = np.abs(vals[sel])
+        if top_k <= 0:
+            keep = np.empty(0, dtype=np.intp)
+        elif top_k < len(sel):
+            keep = np.argpartition(-mag, top_k - 1)[:top_k]
+        else:
+            keep = np.arange(len(sel))
+        sel = sel[keep[np.lexsort((keep, -mag[keep]))]]
     
-    for i, ticker1 in enumerate(tickers):
-        for ticker2 in tickers[i+1:]:  # Avoid duplicates
-            corr = corr_matrix.loc[ticker1, ticker2]
-            
-            # Strong positive or negative correlation
-            if abs(corr) >= threshold:
-                correlations.append({
-                    "ticker1": ticker1,
-                    "ticker2": ticker2,
-                    "correlation": round(corr, 3),
-                    "type": "positive" if corr > 0 else "negative",
-                    "strength": "very_strong" if abs(corr) >= 0.85 else "strong",
-                })
+    correlations = []
+    for k in sel:
+        corr = vals[k]
+        correlations.append({
+            "ticker1": tickers[iu[k]],
+            "ticker2": tickers[ju[k]],
+            "correlation": float(round(corr, 3)),
+            "type": "positive" if corr > 0 else "negative",
+            "strength": "very_strong" if abs(corr) >= 0.85 else "strong",
+        })
     
     return correlations
 
@@ -130,45 +267,46 @@ def detect_divergences(prices: pd.DataFrame, correlations: List[Dict],
     - Leading indicator (one leads, other follows)
     - Fundamental change
     """
+    # Calculate recent returns from the two rows involved only
+    # (same values as prices.pct_change(lookback_days).iloc[-1])
+    if len(prices) <= lookback_days:
+        return []
+    last = prices.iloc[-1].to_numpy(dtype=np.float64)
+    base = prices.iloc[-1 - lookback_days].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = last / base - 1.0
+    idx = {t: i for i, t in enumerate(prices.columns)}
+    
+    pairs = [p for p in correlations if p["ticker1"] in idx and p["ticker2"] in idx]
+    if not pairs:
+        return []
+    
+    # Gather both legs for all pairs at once
+    i1 = np.fromiter((idx[p["ticker1"]] for p in pairs), dtype=np.intp, count=len(pairs))
+    i2 = np.fromiter((idx[p["ticker2"]] for p in pairs), dtype=np.intp, count=len(pairs))
+    r1 = ret[i1]
+    r2 = ret[i2]
+    
+    # Positive correlation expects similar returns (|r1 - r2|),
+    # negative expects opposite returns (|r1 + r2|)
+    sign = np.fromiter((1.0 if p["type"] == "positive" else -1.0 for p in pairs),
+                       dtype=np.float64, count=len(pairs))
+    div = np.abs(r1 - sign * r2)
+    
+    # Significant divergence? (NaN = missing data never passes)
     divergences = []
-    
-    # Calculate recent returns
-    recent_returns = prices.pct_change(lookback_days).iloc[-1]
-    
-    for pair in correlations:
-        ticker1 = pair["ticker1"]
-        ticker2 = pair["ticker2"]
-        
-        if ticker1 not in recent_returns or ticker2 not in recent_returns:
-            continue
-        
-        ret1 = recent_returns[ticker1]
-        ret2 = recent_returns[ticker2]
-        
-        # Skip if data is missing
-        if pd.isna(ret1) or pd.isna(ret2):
-            continue
-        
-        # Calculate divergence
-        if pair["type"] == "positive":
-            # For positive correlation, expect similar returns
-            divergence = abs(ret1 - ret2)
-        else:
-            # For negative correlation, expect opposite returns
-            divergence = abs(ret1 + ret2)
-        
-        # Significant divergence?
-        if divergence >= divergence_threshold:
-            divergences.append({
-                "ticker1": ticker1,
-                "ticker2": ticker2,
-                "correlation": pair["correlation"],
-                "ticker1_return": round(ret1 * 100, 2),
-                "ticker2_return": round(ret2 * 100, 2),
-                "divergence_magnitude": round(divergence * 100, 2),
-                "signal": "mean_reversion_opportunity",
-                "lookback_days": lookback_days,
-            })
+    for k in np.flatnonzero(div >= divergence_threshold):
+        pair = pairs[k]
+        divergences.append({
+            "ticker1": pair["ticker1"],
+            "ticker2": pair["ticker2"],
+            "correlation": pair["correlation"],
+            "ticker1_return": float(round(r1[k] * 100, 2)),
+            "ticker2_return": float(round(r2[k] * 100, 2)),
+            "divergence_magnitude": float(round(div[k] * 100, 2)),
+            "signal": "mean_reversion_opportunity",
+            "lookback_days": lookback_days,
+        })
     
     return divergences
 
@@ -185,19 +323,33 @@ def calculate_lead_lag(prices: pd.DataFrame, ticker1: str, ticker2: str, max_lag
     returns1 = prices[ticker1].pct_change().dropna()
     returns2 = prices[ticker2].pct_change().dropna()
     
-    # Calculate correlation at different lags
-    correlations = []
-    for lag in range(-max_lag, max_lag + 1):
-        if lag == 0:
-            corr = returns1.corr(returns2)
-        elif lag > 0:
-            # ticker1 leads ticker2 by 'lag' days
-            corr = returns1.shift(lag).corr(returns2)
-        else:
-            # ticker2 leads ticker1 by 'lag' days
-            corr = returns1.corr(returns2.shift(-lag))
-        
-        correlations.append((lag, corr))
+    # Calculate correlation at all lags at once. Row k pairs the values that
+    # returns1.shift(lag).corr(returns2) (lag > 0) or returns1.corr(returns2.shift(-lag))
+    # (lag < 0) would pair: common dates, positions shifted within each series.
+    lags = np.arange(-max_lag, max_lag + 1)
+    common = returns1.index.intersection(returns2.index)
+    p1 = returns1.index.get_indexer(common)
+    p2 = returns2.index.get_indexer(common)
+    r1 = returns1.to_numpy(dtype=np.float64)
+    r2 = returns2.to_numpy(dtype=np.float64)
+    q1 = p1[None, :] - np.clip(lags, 0, None)[:, None]   # ticker1 leads ticker2
+    q2 = p2[None, :] - np.clip(-lags, 0, None)[:, None]  # ticker2 leads ticker1
+    x = np.where(q1 >= 0, r1[np.maximum(q1, 0)], np.nan) if len(r1) else np.full(q1.shape, np.nan)
+    y = np.where(q2 >= 0, r2[np.maximum(q2, 0)], np.nan) if len(r2) else np.full(q2.shape, np.nan)
+    
+    # Pearson per row over pairwise-valid entries (as Series.corr drops NaN pairs)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx = np.where(valid, x, 0.0).sum(axis=1) / n
+        my = np.where(valid, y, 0.0).sum(axis=1) / n
+        dx = np.where(valid, x - mx[:, None], 0.0)
+        dy = np.where(valid, y - my[:, None], 0.0)
+        # Divide by each std separately, as np.corrcoef does (keeps exact +/-1 results)
+        corr = (dx * dy).sum(axis=1) / np.sqrt((dx * dx).sum(axis=1)) / np.sqrt((dy * dy).sum(axis=1))
+    corr = np.clip(corr, -1.0, 1.0)
+    
+    correlations = list(zip(lags.tolist(), corr))
     
     # Find strongest correlation
     best_lag, best_corr = max(correlations, key=lambda x: abs(x[1]) if not pd.isna(x[1]) else 0)
@@ -224,7 +376,7 @@ def calculate_lead_lag(prices: pd.DataFrame, ticker1: str, ticker2: str, max_lag
     }
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description="Calculate cross-correlations and detect divergences"
     )
@@ -252,8 +404,22 @@ def main():
         default=Path("queue/signals"),
         help="Output directory for correlation signals"
     )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=None,
+        help="Rolling correlation state (.npz). When present, only recent days are fetched and the matrix is updated incrementally"
+    )
+    parser.add_argument(
+        "--float32",
+        action="store_true",
+        help="Compute the full correlation matrix in float32 (wide universes; pairs near the threshold may flip)"
+    )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    # The rolling state keeps float64 sums (cancellation-sensitive); no float32 variant
+    if args.float32 and args.state:
+        parser.error("--float32 cannot be combined with --state")
     
     # Load universe
     universe = load_universe_tickers(args.universe)
@@ -263,18 +429,48 @@ def main():
     
     tickers = [u["ticker"] for u in universe]
     
-    # Fetch price data
-    prices = fetch_price_data(tickers, args.days)
+    rolling = None
+    if args.state and args.state.exists():
+        try:
+            rolling = RollingCorrelation.load(args.state)
+        except Exception as e:
+            print(f"[CORRELATION] Ignoring unreadable state {args.state}: {e}")
+    
+    corr_matrix = None
+    if rolling is not None and len(rolling.dates):
+        # Incremental: fetch only the gap since the last stored day (plus enough
+        # history for the 10-day divergence lookback), then slide the window
+        gap_days = (np.datetime64("now", "ns") - rolling.dates[-1]) // np.timedelta64(1, "D")
+        prices = fetch_price_data(tickers, max(int(gap_days) + 7, 30))
+        if prices.empty:
+            print("[CORRELATION] No recent price data for incremental update; recomputing")
+        elif set(rolling.tickers) != set(prices.columns):
+            # Any added, removed or now-missing symbol: the stored window no longer
+            # covers the priced universe
+            print("[CORRELATION] Universe changed since last state; recomputing")
+        else:
+            added = rolling.update(calculate_returns(prices[rolling.tickers]))
+            print(f"[CORRELATION] Incremental update: {added} new day(s), window={rolling.window}")
+            corr_matrix = rolling.matrix()
     
-    if prices.empty:
-        print("[CORRELATION] No price data fetched")
-        return 1
+    if corr_matrix is None:
+        # Fetch price data
+        prices = fetch_price_data(tickers, args.days)
+        
+        if prices.empty:
+            print("[CORRELATION] No price data fetched")
+            return 1
+        
+        # Calculate returns and correlations
+        returns = calculate_returns(prices)
+        corr_matrix = calculate_correlation_matrix(returns, np.float32 if args.float32 else np.float64)
+        if args.state:
+            rolling = RollingCorrelation.from_returns(returns)
     
     print(f"[CORRELATION] Got price data for {len(prices.columns)} tickers")
     
-    # Calculate returns and correlations
-    returns = calculate_returns(prices)
-    corr_matrix = calculate_correlation_matrix(returns)
+    if args.state and rolling is not None:
+        rolling.save(args.state)
     
     # Find strong correlations
     print(f"[CORRELATION] Calculating correlations (threshold={args.correlation_threshold})...")
@@ -294,30 +490,35 @@ def main():
     
     # Write correlations
     corr_path = args.output_dir / f"correlations_{timestamp}.jsonl"
-    with corr_path.open("w", encoding="utf-8") as f:
-        for corr in strong_corrs:
-            signal = {
-                "source": "correlation_engine",
-                "signal_type": "correlation_pair",
-                "event_datetime": datetime.now().isoformat(),
-                **corr
-            }
-            f.write(json.dumps(signal, ensure_ascii=False) + "\n")
+    # (records serialized up front, one write per file)
+    lines = []
+    for corr in strong_corrs:
+        signal = {
+            "source": "correlation_engine",
+            "signal_type": "correlation_pair",
+            "event_datetime": datetime.now().isoformat(),
+            **corr
+        }
+        lines.append(dumps_line(signal))
+    with corr_path.open("wb") as f:
+        f.write(b"".join(lines))
     
     print(f"[CORRELATION] Wrote {len(strong_corrs)} correlations to {corr_path.name}")
     
     # Write divergences
     if divergences:
         div_path = args.output_dir / f"divergences_{timestamp}.jsonl"
-        with div_path.open("w", encoding="utf-8") as f:
-            for div in divergences:
-                signal = {
-                    "source": "correlation_engine",
-                    "signal_type": "divergence_alert",
-                    "event_datetime": datetime.now().isoformat(),
-                    **div
-                }
-                f.write(json.dumps(signal, ensure_ascii=False) + "\n")
+        lines = []
+        for div in divergences:
+            signal = {
+                "source": "correlation_engine",
+                "signal_type": "divergence_alert",
+                "event_datetime": datetime.now().isoformat(),
+                **div
+            }
+            lines.append(dumps_line(signal))
+        with div_path.open("wb") as f:
+            f.write(b"".join(lines))
         
         print(f"[CORRELATION] Wrote {len(divergences)} divergences to {div_path.name}")
     
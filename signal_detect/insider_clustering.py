@@ -9,20 +9,24 @@ Clustering signals:
 import json
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
-from data_ingest.form4_parser import fetch_form4_xml, parse_form4_xml, is_bullish_transaction
+from data_ingest.form4_parser import parse_form4_cached, is_bullish_transaction
+from shared.jsonl import dumps_line
 
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # optional JIT; the pure-Python kernel below is used as-is
+    np = None
+    njit = None
 
-def analyze_form4_file(filepath: Path) -> List[Dict[str, Any]]:
-    """
-    Parse all Form 4s in a JSONL file and extract transaction details.
-    
-    Returns list of enriched transactions with insider info.
-    """
-    transactions = []
+
+def _read_filings(filepath: Path) -> List[Tuple[str, str]]:
+    """(accession_number, cik) for each usable row of a form4_*.jsonl file."""
+    filings = []
     
     with filepath.open("r", encoding="utf-8") as f:
         for line in f:
@@ -33,36 +37,150 @@ def analyze_form4_file(filepath: Path) -> List[Dict[str, Any]]:
             
             if not (acc_num and cik):
                 continue
-            
-            # Fetch and parse XML
-            xml = fetch_form4_xml(acc_num, cik)
-            if not xml:
-                continue
-            
-            parsed = parse_form4_xml(xml)
-            
-            # Extract each transaction with insider context
-            for txn in parsed["transactions"]:
-                transactions.append({
-                    "issuer_cik": parsed["issuer_cik"],
-                    "issuer_name": parsed["issuer_name"],
-                    "issuer_ticker": parsed["issuer_ticker"],
-                    "insider_name": parsed["reporting_owner_name"],
-                    "insider_cik": parsed["reporting_owner_cik"],
-                    "is_director": parsed["is_director"],
-                    "is_officer": parsed["is_officer"],
-                    "transaction_date": txn["transaction_date"],
-                    "transaction_code": txn["transaction_code"],
-                    "shares": txn["shares"],
-                    "price_per_share": txn["price_per_share"],
-                    "acquired_disposed": txn["acquired_disposed"],
-                    "is_bullish": is_bullish_transaction(txn),
-                    "accession_number": acc_num,
-                })
+            filings.append((acc_num, cik))
+    
+    return filings
+
+
+def candidate_issuers(filepaths: Iterable[Path], min_insiders: int) -> Set[str]:
+    """
+    Issuer CIKs that can still produce a cluster, from the JSONL rows alone.
+    
+    Each Form 4 has one reporting owner, so an issuer's distinct accession
+    numbers bound its distinct insiders; issuers below min_insiders are
+    skipped before any XML is fetched.
+    """
+    accessions: Dict[str, Set[str]] = {}
+    for filepath in filepaths:
+        for acc_num, cik in _read_filings(filepath):
+            accessions.setdefault(cik, set()).add(acc_num)
+    return {cik for cik, accs in accessions.items() if len(accs) >= min_insiders}
+
+
+def analyze_form4_file(filepath: Path, workers: int = 8, issuers: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Parse all Form 4s in a JSONL file and extract transaction details.
+    
+    Filings are fetched on a thread pool (network-bound; the SEC request rate
+    is capped inside form4_parser). Results keep file order.
+    If issuers is given, filings for other issuer CIKs are not fetched.
+    
+    Returns list of enriched transactions with insider info.
+    """
+    filings = _read_filings(filepath)
+    if issuers is not None:
+        filings = [fc for fc in filings if fc[1] in issuers]
+    
+    if not filings:
+        return []
+    
+    # Fetch and parse XML (disk-cached per filing)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda fc: parse_form4_cached(*fc), filings))
+    
+    transactions = []
+    
+    for (acc_num, _), parsed in zip(filings, results):
+        if not parsed:
+            continue
+        
+        # Extract each transaction with insider context
+        for txn in parsed["transactions"]:
+            transactions.append({
+                "issuer_cik": parsed["issuer_cik"],
+                "issuer_name": parsed["issuer_name"],
+                "issuer_ticker": parsed["issuer_ticker"],
+                "insider_name": parsed["reporting_owner_name"],
+                "insider_cik": parsed["reporting_owner_cik"],
+                "is_director": parsed["is_director"],
+                "is_officer": parsed["is_officer"],
+                "transaction_date": txn["transaction_date"],
+                "transaction_code": txn["transaction_code"],
+                "shares": txn["shares"],
+                "price_per_share": txn["price_per_share"],
+                "acquired_disposed": txn["acquired_disposed"],
+                "is_bullish": is_bullish_transaction(txn),
+                "accession_number": acc_num,
+            })
     
     return transactions
 
 
+_EPOCH = datetime(1970, 1, 1)
+_US_PER_DAY = 86_400_000_000
+
+
+def _date_us(value: str) -> int:
+    """ISO date/datetime -> integer microseconds since epoch (aware values via UTC)."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _first_cluster(dates, insider_ids, counts, window, min_insiders) -> Tuple[int, int]:
+    """
+    Two-pointer sliding window over one company's transactions (dates non-decreasing).
+
+    For each anchor `left`, the window is the run of transactions from left whose
+    date is <= dates[left] + window; `right` only moves forward, with a running
+    per-insider count, so the sweep is O(n). Returns (start, end) of the first
+    window with at least min_insiders distinct insider ids, else (-1, -1).
+    Plain ints/indexing only, so it also compiles under numba.njit.
+    counts: per-insider scratch array initialised to 0.
+    """
+    n = len(dates)
+    right = 0
+    distinct = 0
+    for left in range(n):
+        limit = dates[left] + window
+        while right < n and dates[right] <= limit:
+            c = insider_ids[right]
+            if counts[c] == 0:
+                distinct += 1
+            counts[c] += 1
+            right += 1
+        if distinct >= min_insiders:
+            return left, right
+        # Slide: drop the anchor before moving on
+        c = insider_ids[left]
+        counts[c] -= 1
+        if counts[c] == 0:
+            distinct -= 1
+    return -1, -1
+
+
+_first_cluster_jit = njit(_first_cluster) if njit is not None else None
+
+
+class _CompanyColumns:
+    """
+    One company's transactions as aligned per-field columns (struct of arrays).
+    
+    Row i of every column describes txns[i]; the window kernel reads dates and
+    insider_ids, the cluster summary slices the flag and share columns.
+    """
+    __slots__ = ("cik", "txns", "dates", "insider_ids", "bullish", "bearish", "shares")
+    
+    def __init__(self, cik: Any) -> None:
+        self.cik = cik
+        self.txns: List[Dict[str, Any]] = []
+        self.dates: List[int] = []
+        self.insider_ids: List[int] = []
+        self.bullish: List[bool] = []
+        self.bearish: List[bool] = []
+        self.shares: List[Any] = []
+    
+    def append(self, txn: Dict[str, Any], date_us: int, insider_id: int) -> None:
+        bullish = bool(txn["is_bullish"])
+        self.txns.append(txn)
+        self.dates.append(date_us)
+        self.insider_ids.append(insider_id)
+        self.bullish.append(bullish)
+        self.bearish.append(not bullish and txn["transaction_code"] in ("S", "D"))
+        self.shares.append(txn["shares"])
+
+
 def detect_clusters(transactions: List[Dict[str, Any]], window_days: int = 30, min_insiders: int = 3) -> List[Dict[str, Any]]:
     """
     Detect clustering: when min_insiders or more insiders transact within window_days.
@@ -72,90 +190,117 @@ def detect_clusters(transactions: List[Dict[str, Any]], window_days: int = 30, m
     if not transactions:
         return []
     
-    # Sort by date
-    transactions = sorted(transactions, key=lambda x: x["transaction_date"])
+    # Parse each distinct date string once for the whole batch (dates repeat across filings)
+    date_us: Dict[str, int] = {}
+    for txn in transactions:
+        ds = txn["transaction_date"]
+        if ds not in date_us:
+            date_us[ds] = _date_us(ds)
+    
+    # Sort by date (parsed instant, then string: same order as the ISO strings,
+    # and guarantees the non-decreasing dates the two-pointer window relies on)
+    transactions = sorted(transactions, key=lambda x: (date_us[x["transaction_date"]], x["transaction_date"]))
     
     clusters = []
     
-    # Group by company
-    by_company = defaultdict(list)
+    # Intern CIKs to dense int codes once for the batch (first-appearance
+    # order, like categorical codes) and group by issuer code into aligned
+    # per-field columns in one pass
+    issuer_codes: Dict[Any, int] = {}
+    insider_codes: Dict[Any, int] = {}
+    by_company: List[_CompanyColumns] = []
     for txn in transactions:
-        by_company[txn["issuer_cik"]].append(txn)
+        code = issuer_codes.setdefault(txn["issuer_cik"], len(issuer_codes))
+        if code == len(by_company):
+            by_company.append(_CompanyColumns(txn["issuer_cik"]))
+        by_company[code].append(
+            txn,
+            date_us[txn["transaction_date"]],
+            insider_codes.setdefault(txn["insider_cik"], len(insider_codes)),
+        )
+    
+    window_us = window_days * _US_PER_DAY
+    
+    # One per-insider scratch array for every company: a sweep that finds no
+    # cluster leaves it all zero, a hit leaves counts only for ids in the window
+    if _first_cluster_jit is not None:
+        counts = np.zeros(len(insider_codes), dtype=np.int64)
+    else:
+        counts = [0] * len(insider_codes)
     
-    # Detect clusters per company
-    for cik, company_txns in by_company.items():
-        company_txns = sorted(company_txns, key=lambda x: x["transaction_date"])
+    # Detect clusters per company (groups inherit the date order of the sorted list)
+    for cols in by_company:
+        cik = cols.cik
         
-        # Sliding window approach
-        for i, anchor_txn in enumerate(company_txns):
-            anchor_date = datetime.fromisoformat(anchor_txn["transaction_date"])
-            window_end = anchor_date + timedelta(days=window_days)
-            
-            # Find all transactions within window
-            window_txns = []
-            unique_insiders = set()
-            
-            for txn in company_txns[i:]:
-                txn_date = datetime.fromisoformat(txn["transaction_date"])
-                if txn_date <= window_end:
-                    window_txns.append(txn)
-                    unique_insiders.add(txn["insider_cik"])
-                else:
-                    break
-            
-            # Check if cluster criteria met
-            if len(unique_insiders) >= min_insiders:
-                # Analyze cluster sentiment
-                bullish_count = sum(1 for t in window_txns if t["is_bullish"])
-                bearish_count = sum(1 for t in window_txns if not t["is_bullish"] and t["transaction_code"] in ["S", "D"])
-                
-                total_shares = sum(t["shares"] for t in window_txns)
-                
-                # Determine cluster signal
-                if bullish_count >= min_insiders:
-                    signal_type = "STRONG_BULLISH"
-                    score = 8
-                elif bearish_count >= min_insiders:
-                    signal_type = "BEARISH"
-                    score = 2
-                elif bullish_count > bearish_count:
-                    signal_type = "BULLISH"
-                    score = 6
-                else:
-                    signal_type = "MIXED"
-                    score = 4
-                
-                cluster = {
-                    "signal_type": "insider_cluster",
-                    "issuer_cik": cik,
-                    "issuer_name": window_txns[0]["issuer_name"],
-                    "issuer_ticker": window_txns[0]["issuer_ticker"],
-                    "cluster_start_date": anchor_txn["transaction_date"],
-                    "cluster_end_date": window_txns[-1]["transaction_date"],
-                    "window_days": window_days,
-                    "num_insiders": len(unique_insiders),
-                    "num_transactions": len(window_txns),
-                    "total_shares": int(total_shares),
-                    "bullish_transactions": bullish_count,
-                    "bearish_transactions": bearish_count,
-                    "sentiment": signal_type,
-                    "score": score,
-                    "insiders": [
-                        {
-                            "name": t["insider_name"],
-                            "role": "Director" if t["is_director"] else "Officer" if t["is_officer"] else "Other",
-                            "transaction_code": t["transaction_code"],
-                            "shares": int(t["shares"]),
-                            "date": t["transaction_date"],
-                        }
-                        for t in window_txns
-                    ],
+        # Sliding window approach (first qualifying window per company)
+        n = len(cols.txns)
+        if _first_cluster_jit is not None:
+            start, end = _first_cluster_jit(
+                np.fromiter(cols.dates, dtype=np.int64, count=n),
+                np.fromiter(cols.insider_ids, dtype=np.int64, count=n),
+                counts, window_us, min_insiders,
+            )
+        else:
+            start, end = _first_cluster(cols.dates, cols.insider_ids, counts, window_us, min_insiders)
+        
+        if start < 0:
+            continue
+        for c in cols.insider_ids[start:end]:
+            counts[c] = 0
+        
+        anchor_txn = cols.txns[start]
+        window_txns = cols.txns[start:end]
+        num_insiders = len(set(cols.insider_ids[start:end]))
+        
+        # Analyze cluster sentiment (slice sums over the flag columns)
+        bullish_count = sum(cols.bullish[start:end])
+        bearish_count = sum(cols.bearish[start:end])
+        
+        total_shares = sum(cols.shares[start:end])
+        
+        # Determine cluster signal
+        if bullish_count >= min_insiders:
+            signal_type = "STRONG_BULLISH"
+            score = 8
+        elif bearish_count >= min_insiders:
+            signal_type = "BEARISH"
+            score = 2
+        elif bullish_count > bearish_count:
+            signal_type = "BULLISH"
+            score = 6
+        else:
+            signal_type = "MIXED"
+            score = 4
+        
+        cluster = {
+            "signal_type": "insider_cluster",
+            "issuer_cik": cik,
+            "issuer_name": window_txns[0]["issuer_name"],
+            "issuer_ticker": window_txns[0]["issuer_ticker"],
+            "cluster_start_date": anchor_txn["transaction_date"],
+            "cluster_end_date": window_txns[-1]["transaction_date"],
+            "window_days": window_days,
+            "num_insiders": num_insiders,
+            "num_transactions": len(window_txns),
+            "total_shares": int(total_shares),
+            "bullish_transactions": bullish_count,
+            "bearish_transactions": bearish_count,
+            "sentiment": signal_type,
+            "score": score,
+            "insiders": [
+                {
+                    "name": t["insider_name"],
+                    "role": "Director" if t["is_director"] else "Officer" if t["is_officer"] else "Other",
+                    "transaction_code": t["transaction_code"],
+                    "shares": int(t["shares"]),
+                    "date": t["transaction_date"],
                 }
-                
-                clusters.append(cluster)
-                
-                # Skip ahead to avoid overlapping clusters
-                break
+                for t in window_txns
+            ],
+        }
+        
+        # One cluster per company (no overlapping clusters)
+        clusters.append(cluster)
     
     return clusters
 
@@ -189,6 +334,12 @@ def main():
         default=3,
         help="Minimum insiders for cluster"
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=8,
+        help="Concurrent Form 4 fetches (SEC rate cap still applies)"
+    )
     
     args = parser.parse_args()
     
@@ -208,12 +359,16 @@ def main():
     
     print(f"[INSIDER_CLUSTER] Processing {len(form4_files)} Form 4 file(s)")
     
+    # Only issuers with enough filings across all files can cluster
+    issuers = candidate_issuers(form4_files, args.min_insiders)
+    print(f"[INSIDER_CLUSTER] {len(issuers)} issuer(s) with >= {args.min_insiders} filings")
+    
     all_transactions = []
     
     # Parse all Form 4s
     for filepath in form4_files:
         print(f"[INSIDER_CLUSTER] Parsing {filepath.name}...")
-        transactions = analyze_form4_file(filepath)
+        transactions = analyze_form4_file(filepath, args.fetch_workers, issuers)
         all_transactions.extend(transactions)
         print(f"[INSIDER_CLUSTER]   Found {len(transactions)} transaction(s)")
     
@@ -234,9 +389,8 @@ def main():
     timestamp = dt.now().strftime("%Y%m%d-%H%M%S")
     output_path = args.output_dir / f"insider_clusters_{timestamp}.jsonl"
     
-    with output_path.open("w", encoding="utf-8") as f:
-        for cluster in clusters:
-            f.write(json.dumps(cluster, ensure_ascii=False) + "\n")
+    with output_path.open("wb") as f:
+        f.write(b"".join(dumps_line(cluster) for cluster in clusters))
     
     print(f"[INSIDER_CLUSTER] Wrote {len(clusters)} cluster signal(s) to {output_path.name}")
     
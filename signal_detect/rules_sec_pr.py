@@ -1,4 +1,9 @@
-from typing import List
+from typing import Dict, List, Optional, Set
+
+try:
+    import ahocorasick  # pyahocorasick: optional single-pass matcher
+except ImportError:
+    ahocorasick = None
 
 # Minimal, high-signal keywords. Tune later.
 KEYWORDS = {
@@ -25,18 +30,51 @@ KEYWORDS = {
     ],
 }
 
-def hit_tags(text: str) -> List[str]:
+def _keyword_tags() -> Dict[str, Set[str]]:
+    """Lowered keyword -> tags it feeds (e.g. 'resigns' -> cfo+ceo)."""
+    kw_tags: Dict[str, Set[str]] = {}
+    for tag, keys in KEYWORDS.items():
+        for k in keys:
+            kw_tags.setdefault(k.lower(), set()).add(tag)
+    return kw_tags
+
+_KW_TAGS = _keyword_tags()
+
+def _build_automaton():
+    """Aho-Corasick automaton over _KW_TAGS."""
+    A = ahocorasick.Automaton()
+    for k, tags in _KW_TAGS.items():
+        A.add_word(k, frozenset(tags))
+    A.make_automaton()
+    return A
+
+def _flat_keywords():
+    """(tag, lowered keyword) pairs in KEYWORDS order, for the substring fallback."""
+    return tuple((tag, k.lower()) for tag, keys in KEYWORDS.items() for k in keys)
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+_FLAT = _flat_keywords()
+
+def hit_tags(*parts: Optional[str]) -> List[str]:
     """
     Return list of rule tags that matched the provided text.
     Case-insensitive substring matching; dedup by tag.
+    Several parts (e.g. title, body) are matched as if joined by a space;
+    None/empty parts are skipped, and a single part is scanned without a join.
     """
-    if not text:
+    parts = [p for p in parts if p]
+    if not parts:
         return []
+    text = parts[0] if len(parts) == 1 else " ".join(parts)
     t = text.lower()
-    hits: List[str] = []
-    for tag, keys in KEYWORDS.items():
-        for k in keys:
-            if k in t:
-                hits.append(tag)
-                break  # one hit per tag is enough
-    return hits
+    found: Set[str] = set()
+    if _AUTOMATON is not None:
+        # One pass over the text; all (overlapping) keyword matches
+        for _, tags in _AUTOMATON.iter(t):
+            found |= tags
+    else:
+        # C substring search per keyword; skip keywords of tags already hit
+        for tag, k in _FLAT:
+            if tag not in found and k in t:
+                found.add(tag)
+    return [tag for tag in KEYWORDS if tag in found]
@@ -8,20 +8,50 @@ Fusion logic:
 - Detect alignment vs conflict
 - Output conviction scores (0-100)
 """
-import json
+import os
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
 
+from shared.jsonl import dumps_line, loads
 
-def parse_datetime(dt_str: str) -> datetime:
-    """Parse ISO datetime string to datetime object."""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso(dt_str: str) -> datetime:
+    """Memoized ISO parse (timestamps recur across signals)."""
+    if dt_str[-1] == 'Z':
+        dt_str = dt_str[:-1] + '+00:00'
     try:
-        return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-    except Exception:
-        return datetime.now(timezone.utc)
+        return datetime.fromisoformat(dt_str)
+    except ValueError:
+        return _EPOCH
+
+
+def parse_datetime(dt_str: str) -> datetime:
+    """
+    Parse ISO datetime string to datetime object.
+    Missing or unparseable values map to the _EPOCH sentinel (a fixed value, so
+    sorting stays deterministic; fuse_signals drops these signals).
+    """
+    if not dt_str or not isinstance(dt_str, str):
+        return _EPOCH
+    return _parse_iso(dt_str)
+
+
+def _signal_time(sig: Dict[str, Any]) -> datetime:
+    return parse_datetime(sig.get("event_datetime") or sig.get("event_datetime_utc") or sig.get("cluster_start_date") or "")
+
+
+def _signal_ticker(sig: Dict[str, Any]) -> Any:
+    return sig.get("ticker") or sig.get("issuer_ticker")
 
 
 def score_signal(signal: Dict[str, Any]) -> Dict[str, float]:
@@ -33,84 +63,7 @@ def score_signal(signal: Dict[str, Any]) -> Dict[str, float]:
         - weight: importance multiplier (0.5-2.0)
         - sentiment: -1 (bearish) to +1 (bullish)
     """
-    signal_type = signal.get("signal_type")
-    source = signal.get("source")
-    
-    # Default neutral
-    base_score = 50
-    weight = 1.0
-    sentiment = 0
-    
-    # Insider clustering signals
-    if signal_type == "insider_cluster":
-        cluster_sentiment = signal.get("sentiment", "MIXED")
-        num_insiders = signal.get("num_insiders", 0)
-        
-        if cluster_sentiment == "STRONG_BULLISH":
-            base_score = 85
-            sentiment = 1.0
-            weight = 2.0  # High weight for strong insider buying
-        elif cluster_sentiment == "BULLISH":
-            base_score = 70
-            sentiment = 0.7
-            weight = 1.5
-        elif cluster_sentiment == "BEARISH":
-            base_score = 30
-            sentiment = -0.7
-            weight = 1.5
-        else:  # MIXED
-            base_score = 50
-            sentiment = 0
-            weight = 1.0
-        
-        # Boost for more insiders
-        weight *= (1 + min(num_insiders - 3, 5) * 0.1)
-    
-    # Reddit sentiment signals
-    elif source == "reddit" and signal.get("event_kind") == "social_sentiment":
-        buzz = signal.get("buzz_score", 0)
-        sentiment_score = signal.get("sentiment_score", 0)
-        
-        # Base score from buzz
-        base_score = min(40 + buzz // 2, 80)
-        
-        # Sentiment direction
-        if sentiment_score > 20:
-            sentiment = 0.6
-        elif sentiment_score < -20:
-            sentiment = -0.6
-        else:
-            sentiment = 0
-        
-        # Lower weight - Reddit is noisy
-        weight = 0.8
-        
-        # Boost for very high buzz
-        if buzz > 90:
-            weight = 1.2
-    
-    # SEC filing signals (from existing signal_detect rules)
-    elif source in ["sec_edgar", "SEC"]:
-        # These come from rules_sec_pr.py scoring
-        signal_score = signal.get("score", 0)
-        
-        if signal_score >= 8:
-            base_score = 80
-            sentiment = 0.8
-            weight = 1.8
-        elif signal_score >= 5:
-            base_score = 65
-            sentiment = 0.5
-            weight = 1.3
-        elif signal_score >= 3:
-            base_score = 55
-            sentiment = 0.3
-            weight = 1.0
-        else:
-            base_score = 45
-            sentiment = 0
-            weight = 0.8
-    
+    base_score, weight, sentiment = _score_tuple(signal)
     return {
         "base_score": base_score,
         "weight": weight,
@@ -118,96 +71,213 @@ def score_signal(signal: Dict[str, Any]) -> Dict[str, float]:
     }
 
 
-def fuse_signals(signals: List[Dict[str, Any]], window_hours: int = 48) -> List[Dict[str, Any]]:
+_NEUTRAL = (50, 1.0, 0)
+
+
+def _score_insider(signal: Dict[str, Any]) -> Tuple[float, float, float]:
+    """Insider clustering signals."""
+    cluster_sentiment = signal.get("sentiment", "MIXED")
+    num_insiders = signal.get("num_insiders", 0)
+    
+    if cluster_sentiment == "STRONG_BULLISH":
+        base_score = 85
+        sentiment = 1.0
+        weight = 2.0  # High weight for strong insider buying
+    elif cluster_sentiment == "BULLISH":
+        base_score = 70
+        sentiment = 0.7
+        weight = 1.5
+    elif cluster_sentiment == "BEARISH":
+        base_score = 30
+        sentiment = -0.7
+        weight = 1.5
+    else:  # MIXED
+        base_score = 50
+        sentiment = 0
+        weight = 1.0
+    
+    # Boost for more insiders
+    weight *= (1 + min(num_insiders - 3, 5) * 0.1)
+    return base_score, weight, sentiment
+
+
+def _score_reddit(signal: Dict[str, Any]) -> Tuple[float, float, float]:
+    """Reddit sentiment signals."""
+    if signal.get("event_kind") != "social_sentiment":
+        return _NEUTRAL
+    
+    buzz = signal.get("buzz_score", 0)
+    sentiment_score = signal.get("sentiment_score", 0)
+    
+    # Base score from buzz
+    base_score = min(40 + buzz // 2, 80)
+    
+    # Sentiment direction
+    if sentiment_score > 20:
+        sentiment = 0.6
+    elif sentiment_score < -20:
+        sentiment = -0.6
+    else:
+        sentiment = 0
+    
+    # Lower weight - Reddit is noisy
+    weight = 0.8
+    
+    # Boost for very high buzz
+    if buzz > 90:
+        weight = 1.2
+    return base_score, weight, sentiment
+
+
+def _score_sec(signal: Dict[str, Any]) -> Tuple[float, float, float]:
+    """SEC filing signals (from existing signal_detect rules)."""
+    # These come from rules_sec_pr.py scoring
+    signal_score = signal.get("score", 0)
+    
+    if signal_score >= 8:
+        return 80, 1.8, 0.8
+    elif signal_score >= 5:
+        return 65, 1.3, 0.5
+    elif signal_score >= 3:
+        return 55, 1.0, 0.3
+    else:
+        return 45, 0.8, 0
+
+
+# Scorer per source; insider clusters are keyed on signal_type and checked first
+_SOURCE_SCORERS = {
+    "reddit": _score_reddit,
+    "sec_edgar": _score_sec,
+    "SEC": _score_sec,
+}
+
+
+def _score_tuple(signal: Dict[str, Any]) -> Tuple[float, float, float]:
+    """score_signal as a (base_score, weight, sentiment) tuple; no dict per call."""
+    if signal.get("signal_type") == "insider_cluster":
+        return _score_insider(signal)
+    scorer = _SOURCE_SCORERS.get(signal.get("source"))
+    return scorer(signal) if scorer is not None else _NEUTRAL
+
+
+def fuse_signals(signals: List[Dict[str, Any]], window_hours: int = 48, workers: int = 1) -> List[Dict[str, Any]]:
     """
     Group signals by ticker and time window, then fuse into conviction scores.
     
+    Tickers are independent; with workers > 1 they are fused across processes
+    (output order is unchanged).
+    
     Returns list of fused signal events.
     """
     if not signals:
         return []
     
-    # Group by ticker
-    by_ticker = defaultdict(list)
+    # One (ticker code, time, signal) row per tickered signal: ticker and time
+    # are derived once here and only the row is read afterwards.
+    # Codes follow first appearance, so a single stable sort leaves each ticker's
+    # signals as one contiguous, time-ordered run, tickers in input order.
+    # Signals whose time could not be parsed (the _EPOCH sentinel itself, not a
+    # real 1970 timestamp) are dropped rather than fused at the epoch.
+    codes: Dict[Any, int] = {}
+    rows = []
+    bad_time = 0
     for sig in signals:
-        ticker = sig.get("ticker") or sig.get("issuer_ticker")
+        ticker = _signal_ticker(sig)
         if ticker:
-            by_ticker[ticker].append(sig)
+            t = _signal_time(sig)
+            if t is _EPOCH:
+                bad_time += 1
+                continue
+            rows.append((codes.setdefault(ticker, len(codes)), t, sig))
+    rows.sort(key=itemgetter(0, 1))
+    if bad_time:
+        print(f"[FUSION] Skipped {bad_time} signal(s) with missing or unparseable timestamps")
+    tickers = list(codes)
+    
+    groups = []
+    for code, run in groupby(rows, key=itemgetter(0)):
+        run = list(run)
+        groups.append((tickers[code], [r[1] for r in run], [r[2] for r in run]))
+    
+    # One run timestamp shared by every fused record
+    fuse = partial(_fuse_ticker, window_hours=window_hours, run_ts=datetime.now(timezone.utc).isoformat())
+    
+    workers = max(1, min(workers, len(groups)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            per_ticker = list(ex.map(fuse, groups, chunksize=max(1, len(groups) // (4 * workers))))
+    else:
+        per_ticker = [fuse(group) for group in groups]
     
+    return [fusion for fusions in per_ticker for fusion in fusions]
+
+
+def _fuse_ticker(group: Tuple[Any, List[datetime], List[Dict[str, Any]]], window_hours: int,
+                 run_ts: str) -> List[Dict[str, Any]]:
+    """Fuse one ticker's time-sorted signals (ticker, times, signals) window by window."""
+    ticker, times, ticker_signals = group
     fused = []
     
-    for ticker, ticker_signals in by_ticker.items():
-        # Sort by time
-        ticker_signals = sorted(
-            ticker_signals,
-            key=lambda s: parse_datetime(s.get("event_datetime") or s.get("event_datetime_utc") or s.get("cluster_start_date") or "")
-        )
+    # Sliding window fusion: non-overlapping windows, so j only moves forward
+    n = len(ticker_signals)
+    i = 0
+    while i < n:
+        anchor_time = times[i]
+        window_end = anchor_time + timedelta(hours=window_hours)
+        
+        # Collect signals in window (the anchor always belongs to its own window)
+        j = i + 1
+        while j < n and times[j] <= window_end:
+            j += 1
+        
+        if j - i == 1:
+            fusion = fuse_singleton(ticker, ticker_signals[i], anchor_time, window_end, run_ts)
+        else:
+            fusion = fuse_window(ticker, ticker_signals[i:j], anchor_time, window_end, run_ts)
+        if fusion:
+            fused.append(fusion)
         
-        # Sliding window fusion
-        i = 0
-        while i < len(ticker_signals):
-            anchor = ticker_signals[i]
-            anchor_time = parse_datetime(
-                anchor.get("event_datetime") or 
-                anchor.get("event_datetime_utc") or 
-                anchor.get("cluster_start_date") or ""
-            )
-            window_end = anchor_time + timedelta(hours=window_hours)
-            
-            # Collect signals in window
-            window_signals = []
-            for sig in ticker_signals[i:]:
-                sig_time = parse_datetime(
-                    sig.get("event_datetime") or 
-                    sig.get("event_datetime_utc") or 
-                    sig.get("cluster_start_date") or ""
-                )
-                if sig_time <= window_end:
-                    window_signals.append(sig)
-                else:
-                    break
-            
-            # Fuse if multiple signals or single high-value signal
-            if len(window_signals) >= 1:
-                fusion = fuse_window(ticker, window_signals, anchor_time, window_end)
-                if fusion:
-                    fused.append(fusion)
-            
-            # Move to next unique time
-            i += len(window_signals)
-            if i >= len(ticker_signals):
-                break
+        # Move to the first signal past this window
+        i = j
     
     return fused
 
 
-def fuse_window(ticker: str, signals: List[Dict[str, Any]], start_time: datetime, end_time: datetime) -> Dict[str, Any]:
+def fuse_window(ticker: str, signals: List[Dict[str, Any]], start_time: datetime, end_time: datetime,
+                event_datetime: Optional[str] = None) -> Dict[str, Any]:
     """
     Fuse all signals in a time window for a ticker.
     
+    event_datetime: run timestamp to stamp on the record (default: now).
+    
     Returns fused signal with conviction score.
     """
-    # Score each signal
-    scored = []
+    # Score each signal, emit its component record and accumulate the window
+    # totals in the same pass
+    components = []
+    total_weight = 0
+    score_sum = 0
+    sentiment_sum = 0
+    has_bullish = has_bearish = False
     for sig in signals:
-        scores = score_signal(sig)
-        scored.append({
-            "signal": sig,
-            "base_score": scores["base_score"],
-            "weight": scores["weight"],
-            "sentiment": scores["sentiment"],
-        })
+        base_score, weight, sentiment = _score_tuple(sig)
+        components.append(_component(sig, base_score, weight, sentiment))
+        total_weight += weight
+        score_sum += base_score * weight
+        sentiment_sum += sentiment * weight
+        if sentiment > 0:
+            has_bullish = True
+        elif sentiment < 0:
+            has_bearish = True
     
     # Calculate weighted conviction
-    total_weight = sum(s["weight"] for s in scored)
-    weighted_score = sum(s["base_score"] * s["weight"] for s in scored) / total_weight if total_weight > 0 else 50
+    weighted_score = score_sum / total_weight if total_weight > 0 else 50
     
     # Calculate net sentiment
-    net_sentiment = sum(s["sentiment"] * s["weight"] for s in scored) / total_weight if total_weight > 0 else 0
+    net_sentiment = sentiment_sum / total_weight if total_weight > 0 else 0
     
-    # Detect alignment vs conflict
-    sentiments = [s["sentiment"] for s in scored]
-    alignment = "aligned" if all(s >= 0 for s in sentiments) or all(s <= 0 for s in sentiments) else "conflicted"
+    # Detect alignment vs conflict (all >= 0 or all <= 0)
+    alignment = "conflicted" if has_bullish and has_bearish else "aligned"
     
     # Boost for alignment
     if alignment == "aligned" and len(signals) > 1:
@@ -217,6 +287,39 @@ def fuse_window(ticker: str, signals: List[Dict[str, Any]], start_time: datetime
     if alignment == "conflicted":
         weighted_score *= 0.85
     
+    return _fused_record(ticker, weighted_score, net_sentiment, alignment, start_time, end_time, components,
+                         event_datetime)
+
+
+def fuse_singleton(ticker: str, signal: Dict[str, Any], start_time: datetime, end_time: datetime,
+                   event_datetime: Optional[str] = None) -> Dict[str, Any]:
+    """
+    fuse_window for a one-signal window (the common case): always aligned, no
+    boost or penalty, so only the signal's own score is needed.
+    """
+    base_score, weight, sentiment = _score_tuple(signal)
+    # Same arithmetic as the window sums, so scores match fuse_window exactly
+    weighted_score = base_score * weight / weight if weight > 0 else 50
+    net_sentiment = sentiment * weight / weight if weight > 0 else 0
+    return _fused_record(ticker, weighted_score, net_sentiment, "aligned", start_time, end_time,
+                         [_component(signal, base_score, weight, sentiment)], event_datetime)
+
+
+def _component(signal: Dict[str, Any], base_score: float, weight: float, sentiment: float) -> Dict[str, Any]:
+    """Per-signal entry of a fused record's component_signals."""
+    return {
+        "source": signal.get("source"),
+        "signal_type": signal.get("signal_type") or signal.get("event_kind"),
+        "base_score": base_score,
+        "weight": weight,
+        "sentiment": sentiment,
+    }
+
+
+def _fused_record(ticker: str, weighted_score: float, net_sentiment: float, alignment: str,
+                  start_time: datetime, end_time: datetime, components: List[Dict[str, Any]],
+                  event_datetime: Optional[str] = None) -> Dict[str, Any]:
+    """Build the fused signal from the window's conviction and component records."""
     # Determine conviction level
     if weighted_score >= 80:
         conviction = "HIGH"
@@ -235,26 +338,34 @@ def fuse_window(ticker: str, signals: List[Dict[str, Any]], start_time: datetime
         "conviction_level": conviction,
         "net_sentiment": round(net_sentiment, 2),
         "alignment": alignment,
-        "num_signals": len(signals),
+        "num_signals": len(components),
         "window_start": start_time.isoformat(),
         "window_end": end_time.isoformat(),
-        "event_datetime": datetime.now(timezone.utc).isoformat(),
-        "component_signals": [
-            {
-                "source": sig["signal"].get("source"),
-                "signal_type": sig["signal"].get("signal_type") or sig["signal"].get("event_kind"),
-                "base_score": sig["base_score"],
-                "weight": sig["weight"],
-                "sentiment": sig["sentiment"],
-            }
-            for sig in scored
-        ],
+        "event_datetime": event_datetime or datetime.now(timezone.utc).isoformat(),
+        "component_signals": components,
     }
     
     return fusion
 
 
-def main():
+def _list_signal_files(signals_dir: Path) -> List[Path]:
+    """*.signals.jsonl then insider_clusters_*.jsonl in signals_dir, from one directory scan."""
+    rule_files: List[Path] = []
+    cluster_files: List[Path] = []
+    try:
+        with os.scandir(signals_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("insider_clusters_") and name.endswith(".jsonl"):
+                    cluster_files.append(Path(entry.path))
+                elif name.endswith(".signals.jsonl"):
+                    rule_files.append(Path(entry.path))
+    except FileNotFoundError:
+        return []
+    return rule_files + cluster_files
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(
         description="Fuse multi-source signals into conviction scores"
     )
@@ -276,13 +387,19 @@ def main():
         default=48,
         help="Time window for signal fusion (hours)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes across tickers (1 = serial; helps on large corpora)"
+    )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Load all signals
     all_signals = []
     
-    signal_files = list(args.signals_dir.glob("*.signals.jsonl")) + list(args.signals_dir.glob("insider_clusters_*.jsonl"))
+    signal_files = _list_signal_files(args.signals_dir)
     
     if not signal_files:
         print("[FUSION] No signal files found")
@@ -292,10 +409,10 @@ def main():
     
     for filepath in signal_files:
         try:
-            with filepath.open("r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        all_signals.append(json.loads(line))
+            # Whole file as bytes, split on newlines in C (no file-iterator per line)
+            for line in filepath.read_bytes().split(b"\n"):
+                if line.strip():
+                    all_signals.append(loads(line))
         except Exception as e:
             print(f"[FUSION] Error reading {filepath.name}: {e}")
     
@@ -307,7 +424,7 @@ def main():
     print(f"[FUSION] Fusing signals (window={args.window_hours}h)...")
     
     # Fuse signals
-    fused = fuse_signals(all_signals, args.window_hours)
+    fused = fuse_signals(all_signals, args.window_hours, args.workers)
     
     if not fused:
         print("[FUSION] No fused signals generated")
@@ -318,9 +435,8 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     output_path = args.output_dir / f"fused_{timestamp}.jsonl"
     
-    with output_path.open("w", encoding="utf-8") as f:
-        for fusion in fused:
-            f.write(json.dumps(fusion, ensure_ascii=False) + "\n")
+    with output_path.open("wb") as f:
+        f.write(b"".join(dumps_line(fusion) for fusion in fused))
     
     print(f"[FUSION] Wrote {len(fused)} fused signals to {output_path.name}")
     
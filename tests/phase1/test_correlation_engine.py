@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import signal_detect.correlation_engine as ce
+from signal_detect.correlation_engine import RollingCorrelation, calculate_lead_lag
+
+# pandas' own corr (the reference) warns on degenerate/short inputs
+pytestmark = pytest.mark.filterwarnings("ignore::RuntimeWarning")
+
+def _prices(cols, n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2025-01-01", periods=n, freq="D")
+    return pd.DataFrame({c: 100 * np.cumprod(1 + rng.normal(0, 0.02, n)) for c in cols}, index=idx)
+
+def _reference_lead_lag(prices, t1, t2, max_lag=5):
+    """Per-lag Series.shift().corr() scan, as calculate_lead_lag originally did."""
+    if t1 not in prices.columns or t2 not in prices.columns:
+        return {}
+    r1 = prices[t1].pct_change().dropna()
+    r2 = prices[t2].pct_change().dropna()
+    corrs = []
+    for lag in range(-max_lag, max_lag + 1):
+        if lag == 0:
+            c = r1.corr(r2)
+        elif lag > 0:
+            c = r1.shift(lag).corr(r2)
+        else:
+            c = r1.corr(r2.shift(-lag))
+        corrs.append((lag, c))
+    lag, c = max(corrs, key=lambda x: abs(x[1]) if not pd.isna(x[1]) else 0)
+    if pd.isna(c):
+        return {}
+    if lag == 0:
+        return {"concurrent": True, "correlation": round(c, 3)}
+    leader, follower = (t1, t2) if lag > 0 else (t2, t1)
+    return {"leader": leader, "follower": follower, "lag_days": abs(lag), "correlation": round(c, 3)}
+
+def _assert_same(got, want):
+    assert got.keys() == want.keys()
+    for k in want:
+        if k == "correlation":
+            assert got[k] == pytest.approx(want[k], abs=1e-3)
+        else:
+            assert got[k] == want[k]
+
+def test_lead_lag_detects_shifted_follower():
+    p = _prices(["A"], n=60)
+    # B repeats A's moves two days later
+    p["B"] = p["A"].shift(2).bfill()
+    res = calculate_lead_lag(p, "A", "B")
+    assert (res["leader"], res["follower"], res["lag_days"]) == ("A", "B", 2)
+    assert res["correlation"] == pytest.approx(1.0, abs=1e-3)
+    # Swapped arguments: same relationship, negative lag side
+    res2 = calculate_lead_lag(p, "B", "A")
+    assert (res2["leader"], res2["follower"], res2["lag_days"]) == ("A", "B", 2)
+
+def test_lead_lag_missing_column_and_all_nan_column():
+    p = _prices(["A"])
+    assert calculate_lead_lag(p, "A", "ZZZ") == {}
+    p["N"] = np.nan
+    assert calculate_lead_lag(p, "A", "N") == _reference_lead_lag(p, "A", "N") == {}
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4, 7])
+def test_lead_lag_short_series_matches_reference(n):
+    p = _prices(["A", "B"], n=n, seed=n)
+    _assert_same(calculate_lead_lag(p, "A", "B"), _reference_lead_lag(p, "A", "B"))
+
+def test_lead_lag_matches_reference_with_gaps():
+    rng = np.random.default_rng(3)
+    for trial in range(60):
+        p = _prices(["A", "B"], n=int(rng.integers(5, 50)), seed=trial)
+        # Independent gaps: pct_change().dropna() then leaves misaligned indexes
+        for c in ("A", "B"):
+            p.loc[rng.random(len(p)) < 0.15, c] = np.nan
+        max_lag = int(rng.integers(1, 6))
+        _assert_same(calculate_lead_lag(p, "A", "B", max_lag), _reference_lead_lag(p, "A", "B", max_lag))
+
+# ---- RollingCorrelation -----------------------------------------------------
+
+def _returns(n=200, cols=("A", "B", "C", "D"), seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n, freq="D")
+    base = rng.normal(0, 0.01, n)
+    return pd.DataFrame({c: base * k + rng.normal(0, 0.01, n) for k, c in enumerate(cols)}, index=idx)
+
+def test_rolling_correlation_matches_corr_over_sliding_window():
+    rets = _returns()
+    window = 60
+    rc = RollingCorrelation.from_returns(rets.iloc[:window])
+    pd.testing.assert_frame_equal(rc.matrix(), rets.iloc[:window].corr(), atol=1e-9)
+    end = window
+    rng = np.random.default_rng(1)
+    # Enough updates to pass a REFRESH_EVERY re-sum; overlapping rows are ignored
+    while end < len(rets):
+        new_end = min(end + int(rng.integers(1, 4)), len(rets))
+        assert rc.update(rets.iloc[end - 2:new_end]) == new_end - end
+        end = new_end
+        assert rc.window == window
+        pd.testing.assert_frame_equal(rc.matrix(), rets.iloc[end - window:end].corr(), atol=1e-9)
+    assert rc.updates > RollingCorrelation.REFRESH_EVERY
+
+def test_rolling_correlation_constant_series_is_nan_like_corr():
+    rets = _returns(n=30)
+    rets["K"] = 0.001
+    rc = RollingCorrelation.from_returns(rets.iloc[:20])
+    rc.update(rets)
+    want = rets.iloc[-20:].corr()
+    got = rc.matrix()
+    assert got["K"].isna().all() and want["K"].isna().all()
+    pd.testing.assert_frame_equal(got.drop(index="K", columns="K"), want.drop(index="K", columns="K"), atol=1e-9)
+
+def test_rolling_correlation_save_load_roundtrip(tmp_path):
+    rets = _returns(n=80)
+    rc = RollingCorrelation.from_returns(rets.iloc[:50])
+    rc.update(rets.iloc[:55])
+    path = tmp_path / "state" / "corr.npz"
+    rc.save(path)
+    back = RollingCorrelation.load(path)
+    assert back.tickers == rc.tickers and back.window == rc.window and back.updates == rc.updates
+    np.testing.assert_array_equal(back.dates, rc.dates)
+    pd.testing.assert_frame_equal(back.matrix(), rc.matrix())
+    # Both continue identically
+    rc.update(rets)
+    back.update(rets)
+    pd.testing.assert_frame_equal(back.matrix(), rc.matrix())
+
+# ---- main: incremental --state path ----------------------------------------
+
+def _fake_fetch(calls):
+    def fetch(tickers, days=90):
+        calls.append((list(tickers), days))
+        idx = pd.date_range(end=pd.Timestamp.now().normalize(), periods=min(days, 120), freq="D")
+        cols = {}
+        for t in tickers:
+            rng = np.random.default_rng(sum(map(ord, t)))
+            cols[t] = 100 * np.cumprod(1 + rng.normal(0, 0.02, len(idx)))
+        return pd.DataFrame(cols, index=idx)
+    return fetch
+
+def _universe(path, tickers):
+    path.write_text("ticker\tname\n" + "".join(f"{t}\t{t} Inc\n" for t in tickers), encoding="utf-8")
+
+def test_main_state_recomputes_when_universe_grows(tmp_path, monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(ce, "fetch_price_data", _fake_fetch(calls))
+    uni, state = tmp_path / "u.tsv", tmp_path / "corr.npz"
+    argv = ["--universe", str(uni), "--state", str(state), "--output-dir", str(tmp_path / "out")]
+
+    _universe(uni, ["AAA", "BBB", "CCC"])
+    assert ce.main(argv) == 0
+    assert RollingCorrelation.load(state).tickers == ["AAA", "BBB", "CCC"]
+
+    # Same universe: incremental
+    capsys.readouterr()
+    assert ce.main(argv) == 0
+    assert "Incremental update" in capsys.readouterr().out
+
+    # Grown universe: the new symbol must not be dropped
+    _universe(uni, ["AAA", "BBB", "CCC", "DDD"])
+    assert ce.main(argv) == 0
+    assert "Universe changed" in capsys.readouterr().out
+    assert RollingCorrelation.load(state).tickers == ["AAA", "BBB", "CCC", "DDD"]
+
+def test_main_state_empty_incremental_fetch_has_own_message(tmp_path, monkeypatch, capsys):
+    calls = []
+    fetch = _fake_fetch(calls)
+    monkeypatch.setattr(ce, "fetch_price_data", fetch)
+    uni, state = tmp_path / "u.tsv", tmp_path / "corr.npz"
+    _universe(uni, ["AAA", "BBB"])
+    argv = ["--universe", str(uni), "--state", str(state), "--output-dir", str(tmp_path / "out")]
+    assert ce.main(argv) == 0
+
+    monkeypatch.setattr(ce, "fetch_price_data", lambda tickers, days=90: pd.DataFrame())
+    capsys.readouterr()
+    assert ce.main(argv) == 1
+    out = capsys.readouterr().out
+    assert "No recent price data" in out and "Universe changed" not in out
+
+def test_main_rejects_float32_with_state(tmp_path):
+    with pytest.raises(SystemExit) as exc:
+        ce.main(["--float32", "--state", str(tmp_path / "corr.npz")])
+    assert exc.value.code == 2
@@ -1,7 +1,7 @@
 # tests/phase1/test_dedupe.py
 import os
 from pathlib import Path
-from shared.dedupe import make_hash, SeenStore
+from shared.dedupe import make_hash, precompute_dedupe_key, SeenStore
 
 def test_make_hash_canonicalization_equivalence():
     e1 = {
@@ -79,3 +79,115 @@ def test_seenstore_record_reload_and_ttl(tmp_path: Path):
     # TTL 0 days: nothing should be active
     store3 = SeenStore(state_file, ttl_days=0)
     assert store3.seen(h) is False
+
+def test_seenstore_batched_records_visible_after_flush(tmp_path: Path):
+    state_file = tmp_path / "seen.jsonl"
+    store = SeenStore(state_file, ttl_days=7, batch_size=100)
+    hashes = []
+    for i in range(5):
+        h, key = make_hash({"source": "A", "title": f"T{i}", "event_datetime_utc": "2025-10-04T00:00:00Z"})
+        store.record(h, key)
+        hashes.append(h)
+
+    # Below batch size: nothing on disk yet
+    assert SeenStore(state_file, ttl_days=7).seen(hashes[0]) is False
+
+    store.flush()
+    reloaded = SeenStore(state_file, ttl_days=7)
+    assert all(reloaded.seen(h) for h in hashes)
+
+def test_seenstore_opens_state_lazily_and_flushes_pending_at_exit(tmp_path: Path):
+    from shared import dedupe
+    state_file = tmp_path / "seen.jsonl"
+    # Constructing (e.g. with dedupe disabled) creates no file and no exit hook
+    stores = [SeenStore(state_file) for _ in range(3)]
+    assert not state_file.exists()
+    assert not any(st in dedupe._DIRTY_STORES for st in stores)
+
+    store = SeenStore(state_file, batch_size=100)
+    h, key = make_hash({"source": "A", "title": "T", "event_datetime_utc": "2025-10-04T00:00:00Z"})
+    store.record(h, key)
+    assert store in dedupe._DIRTY_STORES
+    # The single module-level atexit hook flushes whatever is still pending
+    dedupe._flush_dirty_stores()
+    assert store not in dedupe._DIRTY_STORES
+    assert SeenStore(state_file).seen(h) is True
+    store.close()
+
+def test_seenstore_load_stops_at_ttl_and_handles_unordered(tmp_path: Path):
+    import json
+    from datetime import datetime, timedelta, timezone
+
+    now = datetime.now(timezone.utc)
+    h_old, h_new, h_newer = bytes(16), b"\x01" * 16, b"\x02" * 16
+    old = (now - timedelta(days=30)).isoformat()
+    new = (now - timedelta(hours=1)).isoformat()
+    rows = [
+        {"v": 2, "hash": h_old.hex(), "first_seen_utc": old, "last_seen_utc": old, "key": {}},
+        {"v": 2, "hash": h_new.hex(), "first_seen_utc": new, "last_seen_utc": new, "key": {}},
+    ]
+    ordered = tmp_path / "ordered.jsonl"
+    ordered.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    store = SeenStore(ordered, ttl_days=7)
+    assert store.seen(h_new) and not store.seen(h_old)
+
+    # Out-of-order tail: reverse scan bails out and the forward scan still loads both
+    newer = (now - timedelta(minutes=5)).isoformat()
+    rows.insert(1, {"v": 2, "hash": h_newer.hex(), "first_seen_utc": newer, "last_seen_utc": newer, "key": {}})
+    unordered = tmp_path / "unordered.jsonl"
+    unordered.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    store2 = SeenStore(unordered, ttl_days=7)
+    assert store2.seen(h_new) and store2.seen(h_newer) and not store2.seen(h_old)
+
+def test_seenstore_rekeys_legacy_sha256_rows(tmp_path: Path):
+    import json
+    from datetime import datetime, timezone
+    from hashlib import sha256
+
+    e = {"source": "A", "title": "B", "url": "https://ex.com/x", "event_datetime_utc": "2025-10-04T01:02:03Z"}
+    h, key = make_hash(e)
+    legacy_hash = sha256(f"{key['source']}|{key['title']}|{key['url']}|{key['date']}".encode("utf-8")).hexdigest()
+    now = datetime.now(timezone.utc).isoformat()
+    state_file = tmp_path / "seen.jsonl"
+    state_file.write_text(json.dumps({
+        "hash": legacy_hash, "first_seen_utc": now, "last_seen_utc": now, "key": key,
+    }) + "\n", encoding="utf-8")
+
+    assert SeenStore(state_file, ttl_days=7).seen(h) is True
+
+def test_precomputed_dedupe_key_matches_make_hash():
+    e = {
+        "source": " SEC ",
+        "title": "Acme | Files 8-K",
+        "first_url": "HTTPS://Example.com/a?utm_source=x&b=1",
+        "event_datetime_utc": "2025-10-04T12:00:00Z",
+    }
+    key = precompute_dedupe_key(e)
+    assert key == ["sec", "acme | files 8-k", "https://example.com/a?b=1", "2025-10-04"]
+    h_pre, key_pre = make_hash({**e, "_dedupe_key": key})
+    assert (h_pre, key_pre) == make_hash(e)
+    # No usable date: hash depends on 'now', so nothing is precomputed
+    assert precompute_dedupe_key({"source": "SEC", "title": "t"}) is None
+
+def test_seenstore_binary_format_roundtrip_and_export(tmp_path: Path):
+    e = {"source": "SEC", "title": "Acme — 8-K", "first_url": "https://x/a", "event_datetime_utc": "2025-10-04T12:00:00Z"}
+    h, key = make_hash(e)
+    jsonl = tmp_path / "seen.jsonl"
+    with SeenStore(jsonl) as s1:
+        s1.record(h, key)
+
+    # Convert JSONL -> binary, then reload from the binary file
+    binp = tmp_path / "seen.bin"
+    with SeenStore(jsonl) as s2:
+        assert s2.export(binp) == 1
+    with SeenStore(binp) as s3:
+        assert s3.seen(h)
+        assert s3._active[h].key == key
+        h2, key2 = make_hash({**e, "title": "Other"})
+        s3.record(h2, key2)
+
+    # Torn tail from an interrupted append is cut off on load
+    with binp.open("ab") as f:
+        f.write(b"\x40\x00\x00")
+    with SeenStore(binp) as s4:
+        assert s4.seen(h) and s4.seen(h2)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import data_ingest.form4_parser as f4
+
+XML = """<ownershipDocument>
+  <issuer><issuerCik>0000320193</issuerCik><issuerName>Apple Inc.</issuerName><issuerTradingSymbol>AAPL</issuerTradingSymbol></issuer>
+  <reportingOwner><reportingOwnerId><rptOwnerCik>0001</rptOwnerCik><rptOwnerName>Jane Doe</rptOwnerName></reportingOwnerId>
+    <reportingOwnerRelationship><isDirector>1</isDirector></reportingOwnerRelationship></reportingOwner>
+  <nonDerivativeTable><nonDerivativeTransaction>
+    <securityTitle><value>Common</value></securityTitle>
+    <transactionDate><value>2025-01-15</value></transactionDate>
+    <transactionCoding><transactionCode>P</transactionCode></transactionCoding>
+    <transactionAmounts><transactionShares><value>100</value></transactionShares>
+      <transactionPricePerShare><value>10.5</value></transactionPricePerShare>
+      <transactionAcquiredDisposedCode><value>A</value></transactionAcquiredDisposedCode></transactionAmounts>
+  </nonDerivativeTransaction></nonDerivativeTable>
+</ownershipDocument>"""
+
+def test_parse_form4_cached_fetches_once(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("FORM4_CACHE_DIR", str(tmp_path))
+    calls = []
+    def fake_fetch(acc, cik):
+        calls.append((acc, cik))
+        return XML
+    monkeypatch.setattr(f4, "fetch_form4_xml", fake_fetch)
+
+    first = f4.parse_form4_cached("0001-25-000001", "320193")
+    second = f4.parse_form4_cached("0001-25-000001", "320193")
+    assert calls == [("0001-25-000001", "320193")]
+    assert first == second == f4.parse_form4_xml(XML)
+    assert (tmp_path / "320193" / "0001-25-000001.json").exists()
+
+def test_parse_form4_cached_skips_failed_fetch_and_disable(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("FORM4_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(f4, "fetch_form4_xml", lambda acc, cik: None)
+    assert f4.parse_form4_cached("a", "1") is None
+    assert not (tmp_path / "1").exists()
+
+    monkeypatch.setenv("FORM4_CACHE_DISABLE", "1")
+    monkeypatch.setattr(f4, "fetch_form4_xml", lambda acc, cik: XML)
+    assert f4.parse_form4_cached("a", "1")["issuer_ticker"] == "AAPL"
+    assert not (tmp_path / "1").exists()
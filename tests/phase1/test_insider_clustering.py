@@ -0,0 +1,129 @@
+import json
+from pathlib import Path
+
+import signal_detect.insider_clustering as ic
+
+def _write(path: Path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+
+def test_candidate_issuers_skips_fetch_for_sparse_issuers(tmp_path: Path, monkeypatch):
+    a = tmp_path / "form4_a.jsonl"
+    b = tmp_path / "form4_b.jsonl"
+    _write(a, [{"cik": "111", "accession_number": "a1"}, {"cik": "111", "accession_number": "a2"},
+               {"cik": "222", "accession_number": "b1"}, {"cik": "111"}])
+    # Filings for one issuer spread across files still count together; repeats don't
+    _write(b, [{"cik": "111", "accession_number": "a3"}, {"cik": "222", "accession_number": "b1"}])
+
+    issuers = ic.candidate_issuers([a, b], min_insiders=3)
+    assert issuers == {"111"}
+
+    fetched = []
+    def fake_parse(acc, cik):
+        fetched.append((acc, cik))
+        return None
+    monkeypatch.setattr(ic, "parse_form4_cached", fake_parse)
+    assert ic.analyze_form4_file(a, workers=1, issuers=issuers) == []
+    assert fetched == [("a1", "111"), ("a2", "111")]
+
+# ---- detect_clusters regression (both window kernels) ----------------------
+
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+@pytest.fixture(params=["python", "jit"])
+def kernel(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(ic, "_first_cluster_jit", None)
+    else:
+        np = pytest.importorskip("numpy")
+        if ic._first_cluster_jit is None:
+            # numba not installed: drive the same kernel through the numpy-array path
+            monkeypatch.setattr(ic, "np", np)
+            monkeypatch.setattr(ic, "_first_cluster_jit", ic._first_cluster)
+    return request.param
+
+def _txn(day, insider, code="P", bullish=None, cik="111", shares=100):
+    d = (date(2025, 1, 1) + timedelta(days=day)).isoformat() if isinstance(day, int) else day
+    return {
+        "issuer_cik": cik, "issuer_name": f"Co {cik}", "issuer_ticker": "CO",
+        "insider_name": f"Insider {insider}", "insider_cik": insider,
+        "is_director": insider == "A", "is_officer": insider == "B",
+        "transaction_date": d, "transaction_code": code, "shares": shares,
+        "price_per_share": 1.0, "acquired_disposed": "A",
+        "is_bullish": (code == "P") if bullish is None else bullish,
+        "accession_number": f"acc-{insider}-{d}",
+    }
+
+def test_window_edge_is_inclusive(kernel):
+    txns = [_txn(0, "A"), _txn(15, "B"), _txn(30, "C")]
+    (c,) = ic.detect_clusters(txns, window_days=30, min_insiders=3)
+    assert (c["cluster_start_date"], c["cluster_end_date"]) == ("2025-01-01", "2025-01-31")
+    assert c["num_insiders"] == 3
+    # One day past the window edge: no cluster
+    assert ic.detect_clusters([_txn(0, "A"), _txn(15, "B"), _txn(31, "C")], 30, 3) == []
+
+def test_same_day_transactions_keep_input_order(kernel):
+    txns = [_txn(5, "C"), _txn(0, "B"), _txn(5, "A"), _txn(0, "D")]
+    (c,) = ic.detect_clusters(txns, window_days=0, min_insiders=2)
+    # Stable sort by date: ties stay in input order
+    assert [i["name"] for i in c["insiders"]] == ["Insider B", "Insider D"]
+
+def test_repeated_insiders_count_once(kernel):
+    txns = [_txn(0, "A"), _txn(1, "A"), _txn(2, "A"), _txn(3, "B")]
+    assert ic.detect_clusters(txns, 30, 3) == []
+    (c,) = ic.detect_clusters(txns + [_txn(4, "C", shares=50)], 30, 3)
+    assert c["num_insiders"] == 3
+    assert c["num_transactions"] == 5
+    assert c["total_shares"] == 450
+
+@pytest.mark.parametrize("codes,sentiment,score,bull,bear", [
+    ("PPP", "STRONG_BULLISH", 8, 3, 0),
+    ("SDS", "BEARISH", 2, 0, 3),
+    ("PPS", "BULLISH", 6, 2, 1),
+    ("PSD", "MIXED", 4, 1, 2),
+    ("PAA", "BULLISH", 6, 1, 0),  # 'A' is neither bullish nor bearish
+])
+def test_cluster_sentiment_from_mixed_codes(kernel, codes, sentiment, score, bull, bear):
+    txns = [_txn(i, ins, code) for i, (ins, code) in enumerate(zip("ABC", codes))]
+    (c,) = ic.detect_clusters(txns, 30, 3)
+    assert (c["sentiment"], c["score"]) == (sentiment, score)
+    assert (c["bullish_transactions"], c["bearish_transactions"]) == (bull, bear)
+
+def _reference_detect(transactions, window_days, min_insiders):
+    """The original O(n^2) per-anchor scan, for equivalence checks."""
+    out = []
+    by_company = {}
+    for t in sorted(transactions, key=lambda x: x["transaction_date"]):
+        by_company.setdefault(t["issuer_cik"], []).append(t)
+    for cik, txns in by_company.items():
+        for i, anchor in enumerate(txns):
+            end = datetime.fromisoformat(anchor["transaction_date"]) + timedelta(days=window_days)
+            window = []
+            for t in txns[i:]:
+                if datetime.fromisoformat(t["transaction_date"]) > end:
+                    break
+                window.append(t)
+            insiders = {t["insider_cik"] for t in window}
+            if len(insiders) >= min_insiders:
+                out.append((cik, anchor["transaction_date"], window[-1]["transaction_date"],
+                            len(insiders), len(window),
+                            sum(1 for t in window if t["is_bullish"]),
+                            sum(1 for t in window if not t["is_bullish"] and t["transaction_code"] in ("S", "D"))))
+                break
+    return out
+
+def test_matches_reference_scan_on_random_batches(kernel):
+    rng = random.Random(7)
+    for _ in range(150):
+        txns = [
+            _txn(rng.randint(0, 120), rng.choice("ABCDE"), rng.choice("PSDA"),
+                 cik=rng.choice(["111", "222", "333"]), shares=rng.randint(1, 500))
+            for _ in range(rng.randint(0, 40))
+        ]
+        w, m = rng.choice([0, 1, 7, 30]), rng.choice([1, 2, 3, 4])
+        got = [(c["issuer_cik"], c["cluster_start_date"], c["cluster_end_date"], c["num_insiders"],
+                c["num_transactions"], c["bullish_transactions"], c["bearish_transactions"])
+               for c in ic.detect_clusters(txns, w, m)]
+        assert got == _reference_detect(txns, w, m)
@@ -0,0 +1,33 @@
+import pytest
+
+from normalize_enrich.normalizer import to_iso_utc
+
+def test_strict_z_fast_path():
+    assert to_iso_utc("2025-10-04T12:00:00Z") == "2025-10-04T12:00:00+00:00"
+    assert to_iso_utc("2025-13-04T12:00:00Z") is None
+
+@pytest.mark.parametrize("ts", [
+    "2_25-10-04T12:00:00Z",   # int() accepts underscores
+    "2025-+1-04T12:00:00Z",   # ... signs
+    "2025- 1-04T12:00:00Z",   # ... surrounding spaces
+    "٢٠٢٥-10-04T12:00:00Z",   # ... non-ASCII digits
+])
+def test_strict_z_fast_path_rejects_non_ascii_digit_fields(ts):
+    assert to_iso_utc(ts) is None
+
+def test_norm_file_accepts_nan_tokens(tmp_path, monkeypatch):
+    import math
+    from normalize_enrich import normalizer
+    from shared.jsonl import loads
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    monkeypatch.setattr(normalizer, "OUT_DIR", out_dir)
+    normalizer._init_worker({})
+    raw = tmp_path / "pr.jsonl"
+    # Raw producers write with stdlib json.dumps, which emits NaN
+    raw.write_text('{"source":"pr","title":"t","score":NaN}\n{"source":"pr","title":"u"}\n', encoding="utf-8")
+    assert normalizer._norm_file(raw) == 2
+    rows = [loads(l) for l in (out_dir / "pr.norm.jsonl").read_bytes().splitlines()]
+    assert [r["title"] for r in rows] == ["t", "u"]
+    # orjson writes NaN back out as null; stdlib json keeps the NaN token
+    assert rows[0]["score"] is None or math.isnan(rows[0]["score"])
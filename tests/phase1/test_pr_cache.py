@@ -87,3 +87,14 @@ def _caprun_mod(mod, argv) -> Tuple[int, str]:
     finally:
         sys.stdout = old
     return rc, buf.getvalue()
+
+def test_update_cache_reports_validator_changes_only():
+    from shared.http_cache import update_cache_from_parsed
+    url = "https://example.com/feed"
+    cache: Dict[str, Dict[str, str]] = {}
+    assert update_cache_from_parsed(url, _DummyParsed('W/"a"', "Mon"), cache, "t1") is True
+    # Same validators: nothing to persist, 'fetched' stays at the last change
+    assert update_cache_from_parsed(url, _DummyParsed('W/"a"', "Mon"), cache, "t2") is False
+    assert cache[url]["fetched"] == "t1"
+    assert update_cache_from_parsed(url, _DummyParsed('W/"b"', "Mon"), cache, "t3") is True
+    assert cache[url] == {"etag": 'W/"b"', "last_modified": "Mon", "fetched": "t3"}
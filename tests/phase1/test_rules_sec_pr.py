@@ -0,0 +1,29 @@
+from signal_detect.rules_sec_pr import KEYWORDS, hit_tags
+
+def test_hit_tags_shared_keyword_feeds_both_tags_in_keyword_order():
+    # 'steps down' belongs to both resign tags; order follows KEYWORDS
+    assert hit_tags("Officer STEPS DOWN effective today") == ["cfo_resign", "ceo_resign"]
+    assert hit_tags("Board approves special dividend and share buyback") == ["buyback", "dividend"]
+
+def test_hit_tags_is_substring_and_handles_empty():
+    assert hit_tags("") == []
+    assert hit_tags(None) == []
+    # substring semantics: 'repurchased' still contains 'repurchase'
+    assert hit_tags("shares repurchased") == ["buyback"]
+    assert set(hit_tags(" ".join(k for ks in KEYWORDS.values() for k in ks))) == set(KEYWORDS)
+
+def test_hit_tags_parts_match_joined_text():
+    assert hit_tags("Acme CFO", None) == ["cfo_resign"]
+    # keyword spanning the title/body boundary still matches, as with a joined string
+    assert hit_tags("Officer steps", "down") == hit_tags("Officer steps down")
+    assert hit_tags(None, "") == []
+
+def test_hit_tags_automaton_matches_substring_fallback(monkeypatch):
+    import pytest
+    pytest.importorskip("ahocorasick")
+    import signal_detect.rules_sec_pr as rules
+    words = [k for ks in KEYWORDS.values() for k in ks] + ["board", "UPWARD", "x"]
+    texts = [" ".join(words[i:i + 4]) for i in range(len(words))] + ["".join(words)]
+    with_ac = [rules.hit_tags(t) for t in texts]
+    monkeypatch.setattr(rules, "_AUTOMATON", None)
+    assert with_ac == [rules.hit_tags(t) for t in texts]
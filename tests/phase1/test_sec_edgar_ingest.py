@@ -53,3 +53,15 @@ def test_offline_atom_parse_and_filter(tmp_path: Path):
     assert r.get("issuer_name") == "Contoso Energy"
     assert r.get("cik") == "0009876543"
     assert r.get("first_url", "").startswith("https://www.sec.gov/Archives/")
+
+def test_legacy_tsv_strips_row_and_bounds_split():
+    from data_ingest.sec_edgar_ingestor import parse_tsv
+    text = "# header\n  2025-10-04T12:00:00Z\t320193\tAAPL\tApple\t8-K\thttps://x\tTitle\twith tab  \nshort\trow\n"
+    rows = list(parse_tsv(text))
+    assert len(rows) == 1
+    r = rows[0]
+    # Leading/trailing whitespace is trimmed from the whole row
+    assert r["ts"] == "2025-10-04T12:00:00Z"
+    # Split is capped at 7 fields: extra tabs stay inside TITLE
+    assert r["title"] == "Title\twith tab"
+    assert r["meta"]["cik"] == "320193"
@@ -0,0 +1,77 @@
+from signal_detect.signal_fusion import fuse_signals
+
+def _sec(ticker, ts, score=8):
+    return {"ticker": ticker, "source": "SEC", "score": score, "event_datetime": ts}
+
+def test_fuse_signals_splits_non_overlapping_windows():
+    sigs = [
+        _sec("ACME", "2025-01-03T00:00:00Z"),
+        _sec("ACME", "2025-01-01T00:00:00Z"),
+        _sec("ACME", "2025-01-02T23:00:00Z"),
+        _sec("ACME", "2025-01-01T12:00:00Z"),
+        _sec("OTHR", "2025-01-01T00:00:00Z"),
+    ]
+    fused = fuse_signals(sigs, window_hours=24)
+    got = [(f["ticker"], f["window_start"], f["num_signals"]) for f in fused]
+    assert got == [
+        ("ACME", "2025-01-01T00:00:00+00:00", 2),
+        ("ACME", "2025-01-02T23:00:00+00:00", 2),
+        ("OTHR", "2025-01-01T00:00:00+00:00", 1),
+    ]
+
+def test_fuse_signals_negative_window_keeps_one_signal_per_window():
+    sigs = [_sec("ACME", "2025-01-01T00:00:00Z"), _sec("ACME", "2025-01-01T00:00:00Z")]
+    assert [f["num_signals"] for f in fuse_signals(sigs, window_hours=-1)] == [1, 1]
+
+def test_parse_datetime_falls_back_to_epoch():
+    from signal_detect.signal_fusion import parse_datetime
+    epoch = parse_datetime("")
+    assert epoch.isoformat() == "1970-01-01T00:00:00+00:00"
+    assert parse_datetime("not a date") == epoch
+    assert parse_datetime(None) == epoch
+    assert parse_datetime("2025-01-01T12:00:00Z").isoformat() == "2025-01-01T12:00:00+00:00"
+
+def test_fuse_singleton_matches_fuse_window():
+    from datetime import datetime, timezone
+    from signal_detect.signal_fusion import fuse_singleton, fuse_window
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sigs = [
+        _sec("ACME", "2025-01-01T00:00:00Z", score=s) for s in (0, 3, 5, 9)
+    ] + [
+        {"signal_type": "insider_cluster", "sentiment": s, "num_insiders": n}
+        for s in ("STRONG_BULLISH", "BULLISH", "BEARISH", "MIXED") for n in (-7, 0, 4, 11)
+    ] + [{"source": "reddit", "event_kind": "social_sentiment", "buzz_score": 95, "sentiment_score": -30}]
+    for sig in sigs:
+        a = fuse_singleton("ACME", sig, t0, t0)
+        b = fuse_window("ACME", [sig], t0, t0)
+        a.pop("event_datetime")
+        b.pop("event_datetime")
+        assert a == b
+
+def test_fuse_signals_share_one_run_timestamp():
+    sigs = [_sec(t, "2025-01-01T00:00:00Z") for t in ("A", "B", "C")]
+    assert len({f["event_datetime"] for f in fuse_signals(sigs)}) == 1
+
+def test_fuse_signals_workers_match_serial():
+    sigs = [_sec(t, f"2025-01-0{d}T00:00:00Z", score=d) for t in ("A", "B", "C") for d in (1, 2, 5)]
+    strip = lambda fs: [{k: v for k, v in f.items() if k != "event_datetime"} for f in fs]
+    assert strip(fuse_signals(sigs, 30, workers=2)) == strip(fuse_signals(sigs, 30))
+
+def test_fuse_signals_drops_unparseable_timestamps():
+    sigs = [_sec("ACME", "garbage"), _sec("ACME", None), _sec("ACME", "1970-01-01T00:00:00Z")]
+    fused = fuse_signals(sigs)
+    assert [(f["window_start"], f["num_signals"]) for f in fused] == [("1970-01-01T00:00:00+00:00", 1)]
+
+def test_main_loads_nan_lines_written_by_stdlib_json(tmp_path, capsys):
+    import json
+    from signal_detect.signal_fusion import main
+    sig_dir = tmp_path / "signals"
+    sig_dir.mkdir()
+    rows = [_sec("ACME", "2025-01-01T00:00:00Z"),
+            {**_sec("ACME", "2025-01-01T01:00:00Z"), "extra": float("nan")},
+            _sec("ACME", "2025-01-01T02:00:00Z")]
+    # json.dumps writes the non-standard NaN token; the line after it must still load
+    (sig_dir / "a.signals.jsonl").write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    assert main(["--signals-dir", str(sig_dir), "--output-dir", str(tmp_path / "out")]) == 0
+    out = capsys.readouterr().out
+    assert "Loaded 3 signals" in out and "Error reading" not in out
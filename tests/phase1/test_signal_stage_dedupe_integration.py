@@ -79,3 +79,34 @@ def test_signal_detect_dedupes_on_second_run(tmp_path, monkeypatch):
 
     lines2 = out_fp.read_text(encoding="utf-8").splitlines()
     assert len(lines2) == 0, f"Expected 0 signals on second run, got {len(lines2)}"
+
+def test_emitted_signals_keep_event_schema(tmp_path, monkeypatch):
+    """Normalizer-private fields used by the gates are not written to signals."""
+    from normalize_enrich.normalizer import normalize_one
+    from signal_detect.__main__ import main
+
+    monkeypatch.chdir(tmp_path)
+    norm_dir, sig_dir = Path("norm"), Path("sig")
+    norm_dir.mkdir()
+    monkeypatch.setenv("NORM_QUEUE_DIR", str(norm_dir))
+    monkeypatch.setenv("SIG_QUEUE_DIR", str(sig_dir))
+    monkeypatch.delenv("DEDUPE_DISABLE", raising=False)
+
+    raw = {
+        "source": "SEC",
+        "title": "Company announces share repurchase program",
+        "body": "",
+        "ts": "2025-10-04T00:00:00Z",
+        "meta": {"cik": "0000320193", "ticker": "AAPL", "urls": ["https://example.com/a"]},
+    }
+    norm = normalize_one(raw, {})
+    # Precomputed upstream for the dedupe and watchlist gates
+    assert "_dedupe_key" in norm and "_ids" in norm
+    (norm_dir / "t.norm.jsonl").write_text(json.dumps(norm) + "\n", encoding="utf-8")
+
+    main(["--threshold", "1", "--workers", "1"])
+
+    sigs = [json.loads(l) for l in (sig_dir / "t.signals.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(sigs) == 1
+    public = {k for k in norm if k not in ("_dedupe_key", "_ids")}
+    assert set(sigs[0]) == public | {"score", "rule_hits"}
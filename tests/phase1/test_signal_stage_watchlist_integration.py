@@ -1,18 +1,17 @@
-import sys
-import subprocess
+import pytest
 
-def test_signal_detect_help_mentions_watchlist():
-    proc = subprocess.run(
-        [sys.executable, "-m", "signal_detect", "--help"],
-        capture_output=True, text=True
-    )
-    assert "--watchlist" in (proc.stdout + proc.stderr)
+from signal_detect.__main__ import main
 
-def test_missing_watchlist_exits_with_code_2(tmp_path):
+def test_signal_detect_help_mentions_watchlist(capsys):
+    with pytest.raises(SystemExit):
+        main(["--help"])
+    out = capsys.readouterr()
+    assert "--watchlist" in (out.out + out.err)
+
+def test_missing_watchlist_exits_with_code_2(tmp_path, capsys):
     missing = str(tmp_path / "nope.txt")
-    proc = subprocess.run(
-        [sys.executable, "-m", "signal_detect", "--watchlist", missing],
-        capture_output=True, text=True
-    )
-    assert proc.returncode == 2
-    assert "file not found" in (proc.stdout + proc.stderr).lower()
+    with pytest.raises(SystemExit) as exc:
+        main(["--watchlist", missing])
+    assert exc.value.code == 2
+    out = capsys.readouterr()
+    assert "file not found" in (out.out + out.err).lower()
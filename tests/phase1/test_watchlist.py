@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import pytest
+
 from shared.watchlist import Watchlist, load_watchlist, infer_watchlist
 
 WL_TEXT = """\
@@ -13,19 +15,22 @@ BRK.B
 invalid token!
 """
 
-def test_from_file_parses_and_canonicalizes(tmp_path: Path):
-    p = tmp_path / "watchlist.txt"
+@pytest.fixture(scope="module")
+def wl_file(tmp_path_factory) -> Path:
+    # Written once per module; tests only read it
+    p = tmp_path_factory.mktemp("wl") / "watchlist.txt"
     p.write_text(WL_TEXT, encoding="utf-8")
-    wl = load_watchlist(str(p))
+    return p
+
+def test_from_file_parses_and_canonicalizes(wl_file: Path):
+    wl = load_watchlist(str(wl_file))
     assert "AAPL" in wl.tickers
     assert "BRK.B" in wl.tickers
     assert "0000320193" in wl.ciks
     assert "0000789019" in wl.ciks
 
-def test_allowed_by_ticker_and_cik(tmp_path: Path):
-    p = tmp_path / "watchlist.txt"
-    p.write_text("AAPL\n0000789019\n", encoding="utf-8")
-    wl = load_watchlist(str(p))
+def test_allowed_by_ticker_and_cik(wl_file: Path):
+    wl = load_watchlist(str(wl_file))
 
     ev_ticker = {"issuer": {"ticker": "aapl"}}
     ev_cik = {"issuer": {"cik": "789019"}}
@@ -61,10 +66,31 @@ def test_infer_watchlist_env_and_default(tmp_path: Path, monkeypatch):
     wl3 = infer_watchlist(None)
     assert wl3 is not None and "MSFT" in wl3.tickers
 
-def test_disable_via_env(monkeypatch, tmp_path: Path):
+def test_disable_via_env(monkeypatch, wl_file: Path):
+    monkeypatch.setenv("WATCHLIST_FILE", str(wl_file))
+    monkeypatch.setenv("WATCHLIST_DISABLE", "1")
+    wl = infer_watchlist(None)
+    assert wl is None
+
+def test_allowed_uses_precomputed_ids_and_freezes_sets():
+    from shared.watchlist import precompute_ids
+    wl = Watchlist(tickers={"AAPL"}, ciks={"0000789019"}, sectors={"Energy"})
+    assert isinstance(wl.tickers, frozenset) and isinstance(wl.sectors, frozenset)
+    e = {"issuer": {"ticker": " aapl "}, "cik": "789019"}
+    assert precompute_ids(e) == ["AAPL", "0000789019"]
+    assert wl.allowed({**e, "_ids": precompute_ids(e)}) is True
+    # _ids wins over raw fields; sector check still applies
+    assert wl.allowed({"ticker": "AAPL", "_ids": [None, None]}) is False
+    assert wl.allowed({"_ids": [None, None], "sector": "Energy"}) is True
+
+def test_infer_watchlist_reuses_parse_until_file_changes(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("WATCHLIST_DISABLE", raising=False)
     p = tmp_path / "w.txt"
     p.write_text("AAPL\n", encoding="utf-8")
     monkeypatch.setenv("WATCHLIST_FILE", str(p))
-    monkeypatch.setenv("WATCHLIST_DISABLE", "1")
     wl = infer_watchlist(None)
-    assert wl is None
+    assert infer_watchlist(None) is wl
+
+    p.write_text("AAPL\nMSFT\n", encoding="utf-8")
+    wl2 = infer_watchlist(None)
+    assert wl2 is not wl and "MSFT" in wl2.tickers
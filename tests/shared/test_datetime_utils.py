@@ -35,3 +35,12 @@ def test_missing_raises():
 def test_out_of_range():
     with pytest.raises(ValueError):
         parse_to_utc("1900-01-01T00:00:00Z")
+
+def test_digitless_input_is_unparseable():
+    with pytest.raises(ValueError, match="unparseable"):
+        parse_to_utc("not a date")
+
+def test_rfc2822_zero_padded_two_digit_year_maps_like_email_utils():
+    assert to_iso_utc(parse_to_utc("Sun, 05 Oct 0025 06:20:00 GMT")) == "2025-10-05T06:20:00Z"
+    with pytest.raises(ValueError, match="out_of_range"):
+        parse_to_utc("Sun, 05 Oct 0099 06:20:00 GMT")  # -> 1999
@@ -0,0 +1,73 @@
+import json
+
+from shared.jsonl import dumps_line, loads
+
+
+def test_dumps_line_is_utf8_ndjson():
+    rec = {"title": "Société Générale — buyback", "n": 3, "urls": ["https://x"]}
+    line = dumps_line(rec)
+    assert isinstance(line, bytes)
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert "Société".encode("utf-8") in line  # not \u-escaped
+    assert json.loads(line.decode("utf-8")) == rec
+
+
+def test_loads_accepts_bytes_and_str():
+    assert loads(b'{"a": 1}') == {"a": 1}
+    assert loads('{"a": 1}') == {"a": 1}
+
+
+# ---- orjson and stdlib branches agree (except NaN on dump) -----------------
+
+import importlib.util
+import math
+import sys
+
+import pytest
+
+import shared.jsonl as jsonl_mod
+
+BIG = 2 ** 64 + 1
+
+def _stdlib_branch(monkeypatch):
+    # Fresh copy of the module with orjson hidden
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("_jsonl_stdlib", jsonl_mod.__file__)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    assert mod.orjson is None
+    return mod
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def branch(request, monkeypatch):
+    if request.param == "orjson":
+        if jsonl_mod.orjson is None:
+            pytest.skip("orjson not installed")
+        return jsonl_mod
+    return _stdlib_branch(monkeypatch)
+
+def test_loads_accepts_nan_and_infinity_tokens(branch):
+    d = branch.loads(b'{"score": NaN, "hi": Infinity, "lo": -Infinity}')
+    assert math.isnan(d["score"]) and d["hi"] == math.inf and d["lo"] == -math.inf
+    assert math.isnan(branch.loads('{"score": NaN}')["score"])
+
+def test_loads_keeps_big_ints_exact(branch):
+    for n in (BIG, -BIG, 2 ** 63, -(2 ** 63) - 1):
+        got = branch.loads(f'{{"n": {n}}}'.encode())["n"]
+        assert type(got) is int and got == n
+    assert branch.loads('{"n": %d}' % BIG)["n"] == BIG
+
+def test_loads_still_rejects_malformed(branch):
+    with pytest.raises(ValueError):
+        branch.loads(b'{"a": }')
+
+def test_dumps_line_big_ints_roundtrip(branch):
+    line = branch.dumps_line({"n": BIG, "m": -BIG})
+    # Both branches end up in json.dumps for ints beyond 64 bits
+    assert line == b'{"n": %d, "m": %d}\n' % (BIG, -BIG)
+
+def test_dumps_line_nan_differs_by_branch(branch):
+    line = branch.dumps_line({"x": float("nan")})
+    # Documented difference: orjson writes null, stdlib the NaN token
+    expected = b'{"x":null}\n' if branch.orjson is not None else b'{"x": NaN}\n'
+    assert line == expected